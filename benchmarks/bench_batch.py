@@ -0,0 +1,74 @@
+"""
+Benchmark rendering a batch of figures in worker processes.
+
+Renders the same batch of small multi-panel figures with increasing
+numbers of worker processes, reporting the wall time and the mean time
+spent rendering each figure. Run with:
+
+    python benchmarks/bench_batch.py
+
+"""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from panels import FigureSizeLocator, render_batch
+
+
+#: The number of figures in the batch.
+FIGURES = 64
+
+#: The numbers of worker processes to benchmark.
+WORKERS = sorted(set([1, 2, 4, os.cpu_count() or 1]))
+
+
+def draw(fig, locator, data):
+    for ax, y in zip(locator.create_axes(fig).ravel(), data):
+        ax.plot(y)
+
+
+def main():
+    locator = FigureSizeLocator(3, 3, figwidth=160, hsep=8, vsep=8,
+                                padleft=10, padbottom=10, units='mm')
+    data = np.random.RandomState(0).standard_normal((9, 100))
+    print('{:>8s} {:>10s} {:>14s}'.format('workers', 'wall (s)',
+                                          'per figure (s)'))
+    for workers in WORKERS:
+        directory = tempfile.mkdtemp()
+        try:
+            jobs = [(data, draw, os.path.join(directory, '{}.png'.format(n)))
+                    for n in range(FIGURES)]
+            start = time.perf_counter()
+            results = render_batch(locator, jobs, max_workers=workers,
+                                   dpi=100)
+            wall = time.perf_counter() - start
+        finally:
+            shutil.rmtree(directory)
+        print('{:8d} {:10.3f} {:14.3f}'.format(
+            workers, wall, np.mean([r.seconds for r in results])))
+
+
+if __name__ == '__main__':
+    main()
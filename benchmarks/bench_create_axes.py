@@ -0,0 +1,73 @@
+"""
+Benchmark creating axes for a large grid of panels.
+
+Compares the loop over `panel_position_iterator` from the README with
+`create_axes`. Run with:
+
+    python benchmarks/bench_create_axes.py
+
+"""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import timeit
+
+from matplotlib.figure import Figure
+
+from panels import PanelSizeLocator
+
+
+#: The grid sizes to benchmark.
+GRIDS = [(5, 5), (10, 10), (20, 20)]
+
+#: The number of times each benchmark is repeated, the best is reported.
+REPEAT = 3
+
+
+def readme_loop(locator):
+    fig = Figure(figsize=locator.figsize)
+    for pos in locator.panel_position_iterator():
+        ax = fig.add_axes(pos)
+        ax.tick_params(labelsize=6)
+    return fig
+
+
+def create_axes(locator):
+    fig = Figure(figsize=locator.figsize)
+    locator.create_axes(fig, tick_params={'labelsize': 6})
+    return fig
+
+
+def best_time(function, locator):
+    return min(timeit.repeat(lambda: function(locator), number=1,
+                             repeat=REPEAT))
+
+
+def main():
+    print('{:>8s} {:>12s} {:>12s}'.format('panels', 'loop (s)',
+                                          'create_axes (s)'))
+    for rows, columns in GRIDS:
+        locator = PanelSizeLocator(rows, columns, 20, 15, hsep=5, vsep=5)
+        print('{:8d} {:12.3f} {:12.3f}'.format(
+            rows * columns, best_time(readme_loop, locator),
+            best_time(create_axes, locator)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark figure-level panel decorations.
+
+Compares the number of artists and the time taken to draw a figure
+whose axes have their own backgrounds, spines and grid lines, with one
+whose decorations are drawn by `panel_decorations`. Run with:
+
+    python benchmarks/bench_decorations.py
+
+"""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import timeit
+
+from matplotlib.axes import Axes
+from matplotlib.axis import Axis
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.spines import Spine
+
+from panels import (PanelSizeLocator, hide_axes_decorations,
+                    panel_decorations)
+
+
+#: The grid sizes to benchmark.
+GRIDS = [(10, 10), (20, 20), (30, 30)]
+
+#: Grid line positions as fractions of each panel.
+GRID = [0.25, 0.5, 0.75]
+
+#: The number of times each benchmark is repeated, the best is reported.
+REPEAT = 3
+
+
+def per_axes(locator):
+    fig = Figure(figsize=locator.figsize)
+    FigureCanvasAgg(fig)
+    for ax in locator.create_axes(fig).ravel():
+        ax.set_xticks(GRID)
+        ax.set_yticks(GRID)
+        ax.tick_params(length=0, labelbottom=False, labelleft=False)
+        ax.grid(True, color='0.85', linewidth=0.5)
+        ax.plot(GRID, GRID[::-1])
+    return fig
+
+
+def collections(locator):
+    fig = Figure(figsize=locator.figsize)
+    FigureCanvasAgg(fig)
+    panel_decorations(locator, fig, xgrid=GRID, ygrid=GRID)
+    axes = locator.create_axes(fig)
+    hide_axes_decorations(axes)
+    for ax in axes.ravel():
+        ax.set_axis_off()
+        ax.plot(GRID, GRID[::-1])
+    return fig
+
+
+def drawn_artists(artist):
+    """The number of artists drawn for an artist and its children."""
+    if not artist.get_visible():
+        return 0
+    children = artist.get_children()
+    if isinstance(artist, Axes) and not artist.axison:
+        # The axis and spines of axes that are switched off are not drawn:
+        children = [child for child in children
+                    if not isinstance(child, (Axis, Spine))]
+    return 1 + sum(drawn_artists(child) for child in children)
+
+
+def best_draw_time(fig):
+    return min(timeit.repeat(fig.canvas.draw, number=1, repeat=REPEAT))
+
+
+def main():
+    print('{:>8s} {:>10s} {:>16s} {:>10s} {:>16s}'.format(
+        'panels', 'artists', 'artists (coll.)', 'draw (s)',
+        'draw (coll.) (s)'))
+    for rows, columns in GRIDS:
+        locator = PanelSizeLocator(rows, columns, 10, 10, hsep=2, vsep=2)
+        fig = per_axes(locator)
+        fig_collections = collections(locator)
+        print('{:8d} {:10d} {:16d} {:10.3f} {:16.3f}'.format(
+            rows * columns, drawn_artists(fig),
+            drawn_artists(fig_collections), best_draw_time(fig),
+            best_draw_time(fig_collections)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark thinning tick labels on a large grid of panels.
+
+Compares the number of visible text artists and the time taken to save
+a figure, with and without the `label_outer` option of `create_axes`.
+Run with:
+
+    python benchmarks/bench_label_outer.py
+
+"""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import io
+import timeit
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.text import Text
+
+from panels import PanelSizeLocator
+
+
+#: The grid sizes to benchmark.
+GRIDS = [(5, 5), (10, 10), (20, 20)]
+
+#: The output formats to benchmark.
+FORMATS = ['png', 'pdf']
+
+#: The number of times each benchmark is repeated, the best is reported.
+REPEAT = 3
+
+
+def build(locator, label_outer):
+    fig = Figure(figsize=locator.figsize)
+    FigureCanvasAgg(fig)
+    for ax in locator.create_axes(fig, label_outer=label_outer).ravel():
+        ax.plot([0, 1, 2], [3, 2, 1])
+    return fig
+
+
+def visible_text(fig):
+    fig.canvas.draw()
+    return sum(1 for text in fig.findobj(Text)
+               if text.get_visible() and text.get_text())
+
+
+def best_save_time(fig, fmt):
+    return min(timeit.repeat(lambda: fig.savefig(io.BytesIO(), format=fmt),
+                             number=1, repeat=REPEAT))
+
+
+def main():
+    print('{:>8s} {:>6s} {:>12s} {:>12s} {:>12s} {:>12s}'.format(
+        'panels', 'format', 'text', 'text outer', 'save (s)',
+        'save outer (s)'))
+    for rows, columns in GRIDS:
+        locator = PanelSizeLocator(rows, columns, 20, 15, hsep=5, vsep=5,
+                                   padleft=10, padbottom=10)
+        fig = build(locator, False)
+        fig_outer = build(locator, True)
+        for fmt in FORMATS:
+            print('{:8d} {:>6s} {:12d} {:12d} {:12.3f} {:12.3f}'.format(
+                rows * columns, fmt, visible_text(fig),
+                visible_text(fig_outer), best_save_time(fig, fmt),
+                best_save_time(fig_outer, fmt)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark rendering panels separately and compositing them.
+
+Compares drawing every panel on one figure with rendering blocks of
+panels in worker processes using `render_panels`. Run with:
+
+    python benchmarks/bench_raster.py
+
+"""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import os
+import time
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+
+from panels import PanelSizeLocator, render_panels
+
+
+#: The grid sizes to benchmark.
+GRIDS = [(10, 10), (20, 20)]
+
+#: The resolution of the images.
+DPI = 150
+
+#: The numbers of rows and columns of panels in each rendered block.
+BLOCK = (5, 5)
+
+#: The number of worker processes.
+WORKERS = os.cpu_count() or 1
+
+#: The data drawn in every panel.
+DATA = np.random.RandomState(0).standard_normal(500)
+
+
+def draw(ax, row, column):
+    ax.set_axis_off()
+    ax.plot(DATA, linewidth=0.5)
+
+
+def single_canvas(locator):
+    fig = Figure(figsize=locator.figsize, dpi=DPI)
+    canvas = FigureCanvasAgg(fig)
+    for row in range(locator.rows):
+        for column in range(locator.columns):
+            draw(fig.add_axes(locator.panel_position(row, column)),
+                 row, column)
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    print('{} workers, {} x {} blocks'.format(WORKERS, *BLOCK))
+    print('{:>8s} {:>12s} {:>12s}'.format('panels', 'single (s)',
+                                          'sharded (s)'))
+    for rows, columns in GRIDS:
+        locator = PanelSizeLocator(rows, columns, 30, 20, hsep=2, vsep=2)
+        print('{:8d} {:12.3f} {:12.3f}'.format(
+            rows * columns, timed(single_canvas, locator),
+            timed(render_panels, locator, draw, DPI, block=BLOCK,
+                  max_workers=WORKERS)))
+
+
+if __name__ == '__main__':
+    main()
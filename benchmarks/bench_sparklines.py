@@ -0,0 +1,86 @@
+"""
+Benchmark lightweight panels against one axes per panel.
+
+Compares creating and saving a grid of small line plots drawn with an
+axes per panel against `sparklines`. Run with:
+
+    python benchmarks/bench_sparklines.py
+
+"""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import io
+import timeit
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+
+from panels import PanelSizeLocator, sparklines
+
+
+#: The grid sizes to benchmark.
+GRIDS = [(10, 10), (20, 20), (40, 40)]
+
+#: The number of points in each panel.
+POINTS = 100
+
+#: The number of times each benchmark is repeated, the best is reported.
+REPEAT = 3
+
+
+def per_axes(locator, data):
+    fig = Figure(figsize=locator.figsize)
+    FigureCanvasAgg(fig)
+    for pos, (x, y) in zip(locator.panel_position_iterator(), data):
+        ax = fig.add_axes(pos)
+        ax.set_axis_off()
+        ax.plot(x, y, linewidth=0.5)
+    fig.savefig(io.BytesIO(), format='png')
+
+
+def lightweight(locator, data):
+    fig = Figure(figsize=locator.figsize)
+    FigureCanvasAgg(fig)
+    sparklines(locator, fig, data, linewidths=0.5)
+    fig.savefig(io.BytesIO(), format='png')
+
+
+def best_time(function, *args):
+    return min(timeit.repeat(lambda: function(*args), number=1,
+                             repeat=REPEAT))
+
+
+def main():
+    rng = np.random.RandomState(0)
+    print('{:>8s} {:>14s} {:>14s}'.format('panels', 'per axes (s)',
+                                          'sparklines (s)'))
+    for rows, columns in GRIDS:
+        locator = PanelSizeLocator(rows, columns, 8, 5, hsep=1, vsep=1)
+        x = np.arange(POINTS)
+        data = [(x, rng.normal(size=POINTS).cumsum())
+                for _ in range(rows * columns)]
+        print('{:8d} {:14.3f} {:14.3f}'.format(
+            rows * columns, best_time(per_axes, locator, data),
+            best_time(lightweight, locator, data)))
+
+
+if __name__ == '__main__':
+    main()
@@ -21,9 +21,69 @@ Tools for precisely locating panels in multi-panel plots with matplotlib.
 
 from __future__ import (absolute_import, division, print_function)
 
-from ._locators import PanelSizeLocator, FigureSizeLocator
-from ._version import get_versions
+from importlib import import_module
 
 
-__version__ = get_versions()['version']
-del get_versions
+#: Public names of the package mapped to the submodules defining them.
+#: Submodules are only imported when one of their names is first used,
+#: so importing the package itself stays cheap.
+_LAZY_ATTRIBUTES = {
+    'PanelSizeLocator': '_locators',
+    'FigureSizeLocator': '_locators',
+    'FrozenPanelSizeLocator': '_locators',
+    'FrozenFigureSizeLocator': '_locators',
+    'locator_cache_info': '_locators',
+    'clear_locator_caches': '_locators',
+    'GridSizeLocator': '_grid',
+    'GridFigureSizeLocator': '_grid',
+    'FrozenGridSizeLocator': '_grid',
+    'FrozenGridFigureSizeLocator': '_grid',
+    'NestedLocator': '_nesting',
+    'Unit': '_units',
+    'convert_units': '_units',
+    'conversion_factor': '_units',
+    'unit_converter': '_units',
+    'JobResult': '_batch',
+    'render_batch': '_batch',
+    'PanelDecorations': '_decorations',
+    'panel_decorations': '_decorations',
+    'hide_axes_decorations': '_decorations',
+    'PageResult': '_documents',
+    'write_pdf': '_documents',
+    'render_pages': '_documents',
+    'merge_pdf': '_documents',
+    'image_mosaic': '_mosaic',
+    'figimage_mosaic': '_mosaic',
+    'Page': '_pagination',
+    'paginate': '_pagination',
+    'page_count': '_pagination',
+    'render_panels': '_raster',
+    'render_panels_png': '_raster',
+    'write_png': '_raster',
+    'Sparklines': '_sparklines',
+    'sparklines': '_sparklines',
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    # The version is resolved on first access rather than at import time,
+    # in a source checkout this may run git in a subprocess. Installed
+    # packages have a static version string written at build time.
+    if name == '__version__':
+        from ._version import get_versions
+        value = get_versions()['version']
+    else:
+        try:
+            module_name = _LAZY_ATTRIBUTES[name]
+        except KeyError:
+            msg = 'module {!r} has no attribute {!r}'.format(__name__, name)
+            raise AttributeError(msg)
+        value = getattr(import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(['__version__']))
@@ -0,0 +1,149 @@
+"""Creation of matplotlib axes from panel locators."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from matplotlib.projections import get_projection_class
+import numpy as np
+
+
+#: Accepted values of the `sharex` and `sharey` keywords, mapped to a
+#: function returning the index of the axes to share with given the row
+#: and column of a panel.
+_SHARING = {
+    False: None,
+    'none': None,
+    True: lambda row, column: (0, 0),
+    'all': lambda row, column: (0, 0),
+    'row': lambda row, column: (row, 0),
+    'col': lambda row, column: (0, column),
+}
+
+#: Values of `sharex` that share x axes within columns, and of `sharey`
+#: that share y axes within rows, so inner tick labels can be hidden.
+_SHARED_XLABELS = (True, 'all', 'col')
+_SHARED_YLABELS = (True, 'all', 'row')
+
+
+def create_axes(locator, fig, projection=None, sharex=None, sharey=None,
+                tick_params=None, label_outer=False, **kwargs):
+    """
+    Create an axes for every panel of a locator in a figure.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator defining the panel positions.
+
+    * fig: matplotlib.figure.Figure
+        The figure to create the axes in.
+
+    Keyword arguments:
+
+    * projection (default=None): str or projection object
+        The projection of the axes, as accepted by
+        `matplotlib.figure.Figure.add_axes`. The projection is resolved
+        once and used for every panel.
+
+    * sharex, sharey (default=None): bool or str
+        Controls sharing of the x and y axes between panels, as for
+        `matplotlib.pyplot.subplots`. This can be `False` or 'none' for
+        no sharing, `True` or 'all' to share between all panels, 'row'
+        to share between panels in the same row, or 'col' to share
+        between panels in the same column. If not given axes are not
+        shared, unless `label_outer` is used.
+
+    * tick_params (default=None): dict
+        Keyword arguments passed to `tick_params` for every axes.
+
+    * label_outer (default=False): bool
+        If `True` only the panels on the outside of the grid have tick
+        labels, x tick labels are drawn on the bottom row and y tick
+        labels on the left column. Unless sharing is requested
+        explicitly x axes are shared within columns and y axes within
+        rows, so the labels remain valid for the inner panels. Inner
+        x tick labels are only hidden if x axes are shared within
+        columns, and inner y tick labels if y axes are shared within
+        rows. Spines that coincide with a neighbouring panel's spine
+        (where the separation is zero) are also hidden.
+
+    Any other keyword arguments are passed to the constructor of every
+    axes.
+
+    Returns:
+
+    * axes: numpy.ndarray
+        An object array of shape (rows, columns) containing the axes.
+
+    """
+    if sharex is None:
+        sharex = 'col' if label_outer else False
+    if sharey is None:
+        sharey = 'row' if label_outer else False
+    try:
+        sharex_index = _SHARING[sharex]
+        sharey_index = _SHARING[sharey]
+    except (KeyError, TypeError):
+        raise ValueError('the sharex and sharey keywords must be one of '
+                         'True, False, "all", "none", "row" or "col"')
+    # Resolve the projection once, in the same way as Figure.add_axes:
+    if hasattr(projection, '_as_mpl_axes'):
+        projection_class, projection_kwargs = projection._as_mpl_axes()
+        projection_kwargs.update(kwargs)
+        kwargs = projection_kwargs
+    else:
+        projection_class = get_projection_class(projection)
+    axes = np.empty((locator.rows, locator.columns), dtype=object)
+    for row in range(locator.rows):
+        for column in range(locator.columns):
+            if sharex_index is not None:
+                kwargs['sharex'] = axes[sharex_index(row, column)]
+            if sharey_index is not None:
+                kwargs['sharey'] = axes[sharey_index(row, column)]
+            ax = projection_class(fig, locator.panel_position(row, column),
+                                  **kwargs)
+            axes[row, column] = fig.add_axes(ax)
+            if tick_params:
+                ax.tick_params(**tick_params)
+    if label_outer:
+        _thin_decorations(locator, axes, sharex in _SHARED_XLABELS,
+                          sharey in _SHARED_YLABELS)
+    return axes
+
+
+def _thin_decorations(locator, axes, xlabels, ylabels):
+    """
+    Hide the tick labels of inner panels, x tick labels if `xlabels` is
+    true and y tick labels if `ylabels` is true, and any spines that
+    coincide with the spines of an adjacent panel.
+
+    """
+    hseps, vseps = locator._gaps()
+    last_row = locator.rows - 1
+    for row in range(locator.rows):
+        for column in range(locator.columns):
+            ax = axes[row, column]
+            if xlabels and row != last_row:
+                ax.tick_params(axis='x', which='both', labelbottom=False)
+            if column != 0:
+                if ylabels:
+                    ax.tick_params(axis='y', which='both', labelleft=False)
+                if hseps[column - 1] == 0:
+                    ax.spines['left'].set_visible(False)
+            if row != 0 and vseps[row - 1] == 0:
+                ax.spines['top'].set_visible(False)
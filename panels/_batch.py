@@ -0,0 +1,128 @@
+"""Rendering batches of figures sharing a layout in worker processes."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+import traceback
+
+
+#: The outcome of rendering one figure: the output path, the time taken
+#: in seconds, and the formatted traceback if rendering failed (or
+#: `None` if it succeeded).
+JobResult = namedtuple('JobResult', ['path', 'seconds', 'error'])
+
+
+def render_batch(locator, jobs, max_workers=None, dpi=None, chunksize=1,
+                 **savefig_kw):
+    """
+    Render many figures sharing the same layout in parallel.
+
+    Each job is drawn by a callback on a new figure with the size of the
+    locator, and saved with the Agg backend. Every worker process
+    receives the locator once, as a frozen locator whose pickle holds
+    only its parameters, and prepares matplotlib (including its font
+    cache) once before rendering any jobs.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator defining the layout of every figure.
+
+    * jobs: iterable
+        A (data, callback, path) tuple for each figure. The callback is
+        called as `callback(fig, locator, data)` and should draw the
+        figure, for example using `locator.create_axes(fig)`. The
+        callback and data must be picklable, so the callback should be
+        a module-level function.
+
+    Keyword arguments:
+
+    * max_workers (default=None): int
+        The number of worker processes, defaults to the number of CPUs.
+
+    * dpi (default=None): float
+        The resolution of the figures, defaults to matplotlib's
+        configured figure resolution.
+
+    * chunksize (default=1): int
+        The number of jobs sent to a worker at a time, larger chunks
+        reduce communication overhead for very many small jobs.
+
+    Any other keyword arguments are passed to `savefig`.
+
+    Returns:
+
+    * results: list of JobResult
+        A named tuple with fields `path`, `seconds` and `error` for
+        each job, in the order of `jobs`. Failures in one job do not
+        stop the others, they are reported in the `error` field.
+
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_initialize_worker,
+                             initargs=(locator.frozen(), dpi,
+                                       savefig_kw)) as executor:
+        return list(executor.map(_render_job, jobs, chunksize=chunksize))
+
+
+#: The state of a worker process: the locator, the figure resolution and
+#: the keyword arguments for savefig.
+_worker = {}
+
+
+def _initialize_worker(locator, dpi, savefig_kw):
+    """Prepare a worker process for rendering."""
+    _prepare_matplotlib()
+    _worker.update(locator=locator, dpi=dpi, savefig_kw=savefig_kw)
+
+
+def _prepare_matplotlib():
+    """Set up matplotlib for rendering in a worker process."""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    # Drawing some text loads the font cache and the default font, so
+    # the first job does not pay for this:
+    fig = Figure(figsize=(1, 1))
+    fig.text(0.5, 0.5, 'panels')
+    FigureCanvasAgg(fig).draw()
+
+
+def _render_job(job):
+    """Render and save a single figure in a worker process."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    data, callback, path = job
+    start = time.perf_counter()
+    error = None
+    try:
+        locator = _worker['locator']
+        fig = Figure(figsize=locator.figsize, dpi=_worker['dpi'])
+        FigureCanvasAgg(fig)
+        callback(fig, locator, data)
+        fig.savefig(path, **_worker['savefig_kw'])
+    except Exception:
+        error = traceback.format_exc()
+    return JobResult(path, time.perf_counter() - start, error)
@@ -0,0 +1,149 @@
+"""Figure-level panel decorations drawn as collections."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from collections import namedtuple
+
+from matplotlib.collections import LineCollection, PolyCollection
+import numpy as np
+
+
+#: The collections decorating the panels of a figure: the panel
+#: backgrounds and frames, and the grid lines (or `None`).
+PanelDecorations = namedtuple('PanelDecorations', ['panels', 'gridlines'])
+
+
+def panel_decorations(locator, fig, facecolor='white', edgecolor='black',
+                      linewidth=0.8, xgrid=None, ygrid=None, grid_kw=None,
+                      zorder=-1):
+    """
+    Draw the backgrounds and frames of every panel as one collection,
+    and grid lines in every panel as another, in figure coordinates.
+
+    This replaces the face patch, spines and grid lines of each axes,
+    which can then be turned off with `hide_axes_decorations`, reducing
+    the number of artists in a figure with many panels.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator defining the panel positions.
+
+    * fig: matplotlib.figure.Figure
+        The figure to draw in.
+
+    Keyword arguments:
+
+    * facecolor (default='white'): color
+        The background color of the panels, use 'none' for no
+        background.
+
+    * edgecolor (default='black'): color
+        The color of the panel frames, use 'none' for no frames.
+
+    * linewidth (default=0.8): float
+        The width of the panel frames in points.
+
+    * xgrid, ygrid (default=None): sequence of float
+        The positions of vertical (`xgrid`) and horizontal (`ygrid`)
+        grid lines within each panel, as fractions of the panel width
+        or height from its left or bottom edge.
+
+    * grid_kw (default=None): dict
+        Keyword arguments for the grid line `LineCollection`. The
+        default is thin light grey lines.
+
+    * zorder (default=-1): float
+        The z-order of the panel collection, the default draws it
+        behind any axes. Grid lines are drawn just above the panels.
+
+    Returns:
+
+    * decorations: PanelDecorations
+        A named tuple with fields `panels`, the `PolyCollection` of
+        panel backgrounds and frames, and `gridlines`, the
+        `LineCollection` of grid lines or `None` if there are no grid
+        lines.
+
+    """
+    positions = locator.panel_positions(flatten=True)
+    panels = PolyCollection(_panel_outlines(positions), closed=True,
+                            facecolors=facecolor, edgecolors=edgecolor,
+                            linewidths=linewidth, transform=fig.transFigure,
+                            zorder=zorder)
+    fig.add_artist(panels)
+    gridlines = None
+    segments = _grid_segments(positions, xgrid, ygrid)
+    if len(segments):
+        kwargs = {'colors': '0.85', 'linewidths': 0.5}
+        kwargs.update(grid_kw or {})
+        kwargs.setdefault('zorder', zorder + 0.1)
+        gridlines = LineCollection(segments, transform=fig.transFigure,
+                                   **kwargs)
+        fig.add_artist(gridlines)
+    return PanelDecorations(panels, gridlines)
+
+
+def hide_axes_decorations(axes):
+    """
+    Turn off the face patch, spines and grid lines of axes, so they can
+    be replaced by `panel_decorations`.
+
+    Argument:
+
+    * axes: iterable or numpy.ndarray of matplotlib.axes.Axes
+        The axes to modify, such as those returned by `create_axes`.
+
+    """
+    for ax in np.ravel(axes):
+        ax.patch.set_visible(False)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        ax.grid(False)
+
+
+def _panel_outlines(positions):
+    """Rectangular outlines of shape (n, 4, 2) of panels."""
+    x, y, w, h = (positions[:, i] for i in range(4))
+    xs = np.stack([x, x + w, x + w, x], axis=-1)
+    ys = np.stack([y, y, y + h, y + h], axis=-1)
+    return np.stack([xs, ys], axis=-1)
+
+
+def _grid_segments(positions, xgrid, ygrid):
+    """
+    Line segments of shape (n, 2, 2) for the grid lines of all panels in
+    figure coordinates.
+
+    """
+    x, y, w, h = (positions[:, i, np.newaxis] for i in range(4))
+    segments = []
+    if xgrid is not None and len(xgrid):
+        xs = x + w * np.asarray(xgrid, dtype=np.float64)
+        y0, y1 = np.broadcast_arrays(y, y + h, xs)[:2]
+        segments.append(np.stack([np.stack([xs, y0], axis=-1),
+                                  np.stack([xs, y1], axis=-1)], axis=-2))
+    if ygrid is not None and len(ygrid):
+        ys = y + h * np.asarray(ygrid, dtype=np.float64)
+        x0, x1 = np.broadcast_arrays(x, x + w, ys)[:2]
+        segments.append(np.stack([np.stack([x0, ys], axis=-1),
+                                  np.stack([x1, ys], axis=-1)], axis=-2))
+    if not segments:
+        return np.empty((0, 2, 2))
+    return np.concatenate([s.reshape(-1, 2, 2) for s in segments])
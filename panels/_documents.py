@@ -0,0 +1,381 @@
+"""Writing panels to multi-page documents."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+import re
+import tempfile
+import time
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from ._batch import _prepare_matplotlib
+from ._pagination import _page, page_count
+
+
+#: The outcome of writing one page: the page number (counting from 0),
+#: the range of global panel indices on the page, and the time taken to
+#: draw and write the page in seconds.
+PageResult = namedtuple('PageResult', ['number', 'indices', 'seconds'])
+
+
+def write_pdf(locator, draws, path, order='row', shrink_last=False,
+              axes_kw=None, metadata=None, **savefig_kw):
+    """
+    Write panels to a multi-page PDF file, one page at a time.
+
+    Panels are drawn by callbacks taken from an iterator, filling each
+    page before moving on to the next. Each page is written to the file
+    as soon as it is full, and its figure is discarded, so memory use
+    does not grow with the number of pages and the iterator may be
+    arbitrarily long.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator for a full page, usually a `FigureSizeLocator` with
+        the size of the paper.
+
+    * draws: iterable
+        A callable for each panel, called as `draw(ax)` with the axes of
+        the panel. The panels are placed in the order given by `order`.
+
+    * path: str
+        The name of the PDF file to write.
+
+    Keyword arguments:
+
+    * order, shrink_last:
+        As for `paginate`.
+
+    * axes_kw (default=None): dict
+        Keyword arguments passed to the constructor of each axes.
+
+    * metadata (default=None): dict
+        The document information dictionary, passed to
+        `matplotlib.backends.backend_pdf.PdfPages`.
+
+    Any other keyword arguments are passed to `savefig` for each page.
+
+    Returns:
+
+    * results: list of PageResult
+        A named tuple with fields `number`, `indices` and `seconds` for
+        each page written.
+
+    """
+    if order not in ('row', 'column'):
+        raise ValueError('the order keyword must be either "row" or "column"')
+    template = locator.frozen()
+    per_page = template.rows * template.columns
+    draws = iter(draws)
+    axes_kw = axes_kw or {}
+    results = []
+    with PdfPages(path, metadata=metadata) as pdf:
+        while True:
+            chunk = list(islice(draws, per_page))
+            if not chunk:
+                break
+            start = time.perf_counter()
+            number = len(results)
+            # Only the last page can have fewer panels than a full page,
+            # so the panels seen so far are enough to lay out the page:
+            page = _page(template, number * per_page + len(chunk), number,
+                         order, shrink_last)
+            fig = _draw_page(page, chunk, axes_kw)
+            pdf.savefig(fig, **savefig_kw)
+            fig.clear()
+            del fig
+            results.append(PageResult(number, page.indices,
+                                      time.perf_counter() - start))
+    return results
+
+
+def render_pages(locator, draw, count, path, format='pdf', order='row',
+                 shrink_last=False, max_workers=None, axes_kw=None,
+                 tempdir=None, **savefig_kw):
+    """
+    Render the pages of a paginated panel layout in parallel.
+
+    Each page is drawn and saved by a worker process, which computes
+    the page's layout itself from the page locator and the page number,
+    so only these and the draw function are sent to the workers. PDF
+    pages are written to temporary single-page files that are then
+    merged in order into one document by `merge_pdf`.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator for a full page, as for `paginate`.
+
+    * draw: callable
+        A function called as `draw(ax, index)` to draw the panel with
+        the given global index on the axes `ax`. It must be picklable,
+        so should be a module-level function or a `functools.partial`
+        of one.
+
+    * count: int
+        The total number of panels.
+
+    * path: str
+        For PDF output the name of the document to write. For any other
+        format a pattern for the name of the file of each page, which is
+        formatted with the page number, for example 'page{:03d}.png'.
+
+    Keyword arguments:
+
+    * format (default='pdf'): str
+        The format of the output, 'pdf' or any other format supported
+        by matplotlib's Agg backend such as 'png'.
+
+    * order, shrink_last:
+        As for `paginate`.
+
+    * max_workers (default=None): int
+        The number of worker processes, defaults to the number of CPUs.
+        If 1, pages are rendered one after another in this process.
+
+    * axes_kw (default=None): dict
+        Keyword arguments passed to the constructor of each axes.
+
+    * tempdir (default=None): str
+        The directory to write single-page PDF files to before they are
+        merged, defaults to the system temporary directory.
+
+    Any other keyword arguments are passed to `savefig` for each page.
+
+    Returns:
+
+    * results: list of PageResult
+        A named tuple with fields `number`, `indices` and `seconds` for
+        each page, in page order. The time is spent in a worker process
+        and does not include merging.
+
+    """
+    if order not in ('row', 'column'):
+        raise ValueError('the order keyword must be either "row" or "column"')
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    numbers = range(page_count(locator, count))
+    with tempfile.TemporaryDirectory(dir=tempdir) as scratch:
+        if format == 'pdf':
+            pattern = os.path.join(scratch, 'page{}.pdf')
+        else:
+            pattern = path
+        state = (locator.frozen(), count, order, shrink_last, draw,
+                 axes_kw or {}, pattern, dict(savefig_kw, format=format))
+        if max_workers == 1:
+            results = [_render_page(state, number) for number in numbers]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     initializer=_initialize_worker,
+                                     initargs=state) as executor:
+                results = list(executor.map(_render_worker_page, numbers))
+        if format == 'pdf':
+            merge_pdf([pattern.format(number) for number in numbers], path)
+    return results
+
+
+def merge_pdf(sources, path):
+    """
+    Merge PDF files into one document, keeping the pages in order.
+
+    This is a lightweight merger for the documents written by
+    matplotlib, which use a classic cross-reference table. Objects are
+    copied unchanged apart from their numbers, and only one source file
+    is held in memory at a time. The document information of the first
+    source is kept.
+
+    Arguments:
+
+    * sources: iterable of str
+        The names of the PDF files to merge.
+
+    * path: str
+        The name of the merged PDF file to write.
+
+    """
+    # Objects 1 and 2 are the catalog and page tree of the merged
+    # document, they are written last once all the pages are known:
+    offsets = {}
+    kids = []
+    info = None
+    with open(path, 'wb') as f:
+        f.write(b'%PDF-1.4\n%\xac\xdc \xab\xba\n')
+        for source in sources:
+            objects, root, source_info = _read_pdf(source)
+            catalog = _match(rb'/Pages (\d+) \d+ R', objects[root])
+            pages = int(catalog.group(1))
+            skip = {root, pages}
+            if info is not None and source_info is not None:
+                skip.add(source_info)
+            numbers = {pages: 2}
+            for number in sorted(objects):
+                if number not in skip:
+                    numbers[number] = len(offsets) + 3
+                    offsets[numbers[number]] = None
+            if info is None and source_info is not None:
+                info = numbers[source_info]
+            kids.extend(numbers[int(kid)] for kid in re.findall(
+                rb'(\d+) \d+ R',
+                _match(rb'/Kids \[([^\]]*)\]', objects[pages]).group(1)))
+
+            def renumber(match):
+                return b'%d 0 R' % numbers[int(match.group(1))]
+
+            for number in sorted(objects):
+                if number not in skip:
+                    head, stream = _split_stream(objects[number])
+                    offsets[numbers[number]] = f.tell()
+                    f.write(b'%d 0 obj\n' % numbers[number])
+                    f.write(_REFERENCE.sub(renumber, head))
+                    f.write(stream)
+                    f.write(b'\nendobj\n')
+            del objects
+        offsets[2] = f.tell()
+        f.write(b'2 0 obj\n<< /Type /Pages /Kids [ %s ] /Count %d >>\n'
+                b'endobj\n' % (b' '.join(b'%d 0 R' % kid for kid in kids),
+                                len(kids)))
+        offsets[1] = f.tell()
+        f.write(b'1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n')
+        xref = f.tell()
+        size = len(offsets) + 1
+        f.write(b'xref\n0 %d\n0000000000 65535 f \n' % size)
+        for number in range(1, size):
+            f.write(b'%010d 00000 n \n' % offsets[number])
+        trailer = b'/Size %d /Root 1 0 R' % size
+        if info is not None:
+            trailer += b' /Info %d 0 R' % info
+        f.write(b'trailer\n<< %s >>\nstartxref\n%d\n%%%%EOF\n' %
+                (trailer, xref))
+
+
+#: A reference to an indirect object in a PDF file.
+_REFERENCE = re.compile(rb'(\d+) (\d+) R\b')
+
+#: The start of an indirect object in a PDF file.
+_OBJECT = re.compile(rb'(\d+) (\d+) obj\s*')
+
+#: The end of a stream dictionary and the start of its data.
+_STREAM = re.compile(rb'>>\s*stream\r?\n')
+
+
+def _read_pdf(path):
+    """
+    Read the objects of a PDF file using its cross-reference table.
+
+    Returns a dictionary mapping object numbers to the bytes of each
+    object, the number of the catalog, and the number of the document
+    information dictionary (or `None`).
+
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    startxref = data.rindex(b'startxref')
+    xref = int(data[startxref + 9:].split()[0])
+    if not data.startswith(b'xref', xref):
+        raise ValueError('{} has no cross-reference table'.format(path))
+    trailer = data.index(b'trailer', xref)
+    tokens = data[xref + 4:trailer].split()
+    offsets = {}
+    i = 0
+    while i < len(tokens):
+        first, n = int(tokens[i]), int(tokens[i + 1])
+        i += 2
+        for number in range(first, first + n):
+            if tokens[i + 2] == b'n':
+                offsets[number] = int(tokens[i])
+            i += 3
+    # Each object ends before the next one in the file starts:
+    starts = sorted(offsets.values()) + [xref]
+    ends = dict(zip(starts[:-1], starts[1:]))
+    objects = {}
+    for number, offset in offsets.items():
+        chunk = data[offset:ends[offset]]
+        match = _OBJECT.match(chunk)
+        if match is None or int(match.group(1)) != number:
+            raise ValueError('object {} of {} is not at its cross-reference '
+                             'offset'.format(number, path))
+        objects[number] = chunk[match.end():chunk.rindex(b'endobj')].rstrip()
+    trailer = data[trailer:startxref]
+    root = int(_match(rb'/Root (\d+) \d+ R', trailer).group(1))
+    info = re.search(rb'/Info (\d+) \d+ R', trailer)
+    return objects, root, info and int(info.group(1))
+
+
+def _match(pattern, data):
+    """Search for a pattern that must be present in a PDF object."""
+    match = re.search(pattern, data)
+    if match is None:
+        raise ValueError('unsupported PDF structure, no match for '
+                         '{!r}'.format(pattern))
+    return match
+
+
+def _split_stream(body):
+    """
+    Split an object into the part that may contain references and any
+    stream data, which is copied verbatim.
+
+    """
+    match = _STREAM.search(body)
+    if match is None:
+        return body, b''
+    return body[:match.start() + 2], body[match.start() + 2:]
+
+
+#: The state of a worker process rendering pages.
+_worker = {}
+
+
+def _initialize_worker(*state):
+    """Prepare a worker process for rendering pages."""
+    _prepare_matplotlib()
+    _worker['state'] = state
+
+
+def _render_worker_page(number):
+    """Render one page in a worker process."""
+    return _render_page(_worker['state'], number)
+
+
+def _render_page(state, number):
+    """Lay out, draw and save a single page."""
+    (template, count, order, shrink_last, draw, axes_kw, pattern,
+     savefig_kw) = state
+    start = time.perf_counter()
+    page = _page(template, count, number, order, shrink_last)
+    draws = [lambda ax, index=index: draw(ax, index)
+             for index in page.indices]
+    fig = _draw_page(page, draws, axes_kw)
+    fig.savefig(pattern.format(number), **savefig_kw)
+    return PageResult(number, page.indices, time.perf_counter() - start)
+
+
+def _draw_page(page, draws, axes_kw):
+    """Draw the panels of a page on a new figure."""
+    fig = Figure(figsize=page.locator.figsize)
+    for (row, column), draw in zip(page.cells, draws):
+        draw(fig.add_axes(page.locator.panel_position(row, column),
+                          **axes_kw))
+    return fig
@@ -0,0 +1,468 @@
+"""Panel locators with panels of different sizes in each row and column."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from numbers import Number
+import warnings
+
+import numpy as np
+
+from ._locators import (_FrozenLocatorBase, _Layout, _LocatorBase,
+                        _rebuild_frozen, _set_frozen_parameters,
+                        _snap_quantum)
+
+
+#: The parameters that define the geometry of a grid locator, in the
+#: order they are accepted by `GridSizeLocator`.
+_GRID_PARAMETERS = ('columnwidths', 'rowheights', 'hsep', 'vsep', 'padleft',
+                    'padright', 'padtop', 'padbottom', 'units', 'quantum')
+
+#: Attributes of a grid locator that define its geometry, setting any of
+#: these invalidates the cached layout and panels.
+_GRID_GEOMETRY_ATTRIBUTES = frozenset(_GRID_PARAMETERS)
+
+
+class _GridBase(_LocatorBase):
+    """Geometry shared by grid locators."""
+
+    __slots__ = ()
+
+    _parameter_names = _GRID_PARAMETERS
+
+    @property
+    def rows(self):
+        """The number of rows of panels."""
+        return len(self.rowheights)
+
+    @property
+    def columns(self):
+        """The number of columns of panels."""
+        return len(self.columnwidths)
+
+    def _lengths(self):
+        """
+        Return the lengths defining the geometry, as integer multiples
+        of the quantum if one is set, in the order: column widths, row
+        heights, separations between columns, separations between rows,
+        and left, right, top and bottom padding. The first four are
+        tuples with one length per column, row or gap.
+
+        """
+        columnwidths = tuple(self.columnwidths)
+        rowheights = tuple(self.rowheights)
+        if not columnwidths or not rowheights:
+            raise ValueError('a grid must have at least one row and column')
+        lengths = (columnwidths, rowheights,
+                   _per_gap(self.hsep, len(columnwidths) - 1, 'hsep'),
+                   _per_gap(self.vsep, len(rowheights) - 1, 'vsep'),
+                   self.padleft, self.padright, self.padtop, self.padbottom)
+        if self.quantum is None:
+            return lengths
+
+        def quanta(length):
+            return int(round(length / self.quantum))
+
+        lengths = (tuple(tuple(quanta(length) for length in group)
+                         for group in lengths[:4]) +
+                   tuple(quanta(length) for length in lengths[4:]))
+        if min(lengths[0] + lengths[1]) < 1:
+            raise ValueError('every column width and row height must be at '
+                             'least one quantum')
+        return lengths
+
+    def _gaps(self):
+        return self._lengths()[2:4]
+
+    def _subgrid(self, rows, columns):
+        parameters = dict(zip(_GRID_PARAMETERS, self._parameters()))
+        parameters['columnwidths'] = tuple(self.columnwidths)[:columns]
+        parameters['rowheights'] = tuple(self.rowheights)[:rows]
+        for name, count in (('hsep', columns - 1), ('vsep', rows - 1)):
+            if not isinstance(parameters[name], Number):
+                parameters[name] = tuple(parameters[name])[:count]
+        return _rebuild_frozen(FrozenGridSizeLocator,
+                               tuple(parameters[name]
+                                     for name in _GRID_PARAMETERS))
+
+    def _offsets(self, lengths):
+        """
+        Return the offset of every column from the left of the figure and
+        of every row from the top, and the width and height of the
+        figure, from the lengths returned by `_lengths`.
+
+        """
+        (columnwidths, rowheights, hseps, vseps,
+         padleft, padright, padtop, padbottom) = lengths
+        # In fixed-point mode all lengths are integers and the arithmetic
+        # below is exact, until the final division by the figure size:
+        dtype = np.float64 if self.quantum is None else np.int64
+        widths = np.array(columnwidths, dtype=dtype)
+        heights = np.array(rowheights, dtype=dtype)
+        # Prefix sums of the panel sizes and separations give the offset
+        # of every column from the left and every row from the top:
+        left = np.zeros(len(widths), dtype=dtype)
+        np.cumsum(widths[:-1] + np.array(hseps, dtype=dtype), out=left[1:])
+        left += padleft
+        top = np.zeros(len(heights), dtype=dtype)
+        np.cumsum(heights[:-1] + np.array(vseps, dtype=dtype), out=top[1:])
+        top += padtop
+        figwidth = (left[-1] + widths[-1] + padright).item()
+        figheight = (top[-1] + heights[-1] + padbottom).item()
+        return widths, heights, left, top, figwidth, figheight
+
+    def _compute_layout(self):
+        """Compute the figure size and the size of every panel."""
+        widths, heights, _, _, figwidth, figheight = self._offsets(
+            self._lengths())
+        panelwidth_fig = widths / figwidth
+        panelheight_fig = heights / figheight
+        panelwidth_fig.flags.writeable = False
+        panelheight_fig.flags.writeable = False
+        if self.quantum is not None:
+            figwidth = figwidth * self.quantum
+            figheight = figheight * self.quantum
+        return _Layout(figwidth, figheight, panelwidth_fig, panelheight_fig,
+                       {})
+
+    def _compute_positions(self):
+        """Compute the position of every panel."""
+        widths, heights, left, top, figwidth, figheight = self._offsets(
+            self._lengths())
+        positions = np.empty((len(heights), len(widths), 4), dtype=np.float64)
+        positions[..., 0] = left / figwidth
+        positions[..., 1] = ((figheight - top - heights) /
+                             figheight)[:, np.newaxis]
+        positions[..., 2] = widths / figwidth
+        positions[..., 3] = (heights / figheight)[:, np.newaxis]
+        return positions
+
+
+class GridSizeLocator(_GridBase):
+    """A panel locator based on the size of each row and column."""
+
+    def __init__(self, columnwidths, rowheights, hsep=0, vsep=0, padleft=0,
+                 padright=0, padtop=0, padbottom=0, units='mm',
+                 quantum=None, snap=None):
+        """
+        Initialize a locator based on the width of each column and the
+        height of each row of panels. The sizes can be specified in
+        arbitrary units of length specified via the `units` keyword.
+
+        The grid behaves like a `PanelSizeLocator`, except that
+        `panelwidth_fig` and `panelheight_fig` are arrays with the size
+        of each column and row as a fraction of the figure size.
+
+        Arguments:
+
+        * columnwidths: sequence of float
+            The width of the panels in each column, from left to right.
+
+        * rowheights: sequence of float
+            The height of the panels in each row, from top to bottom.
+
+        Keyword arguments:
+
+        * hsep (default=0): float or sequence of float
+            The horizontal spacing between panels in adjacent columns,
+            either a single length or one length for each of the gaps
+            between columns from left to right.
+
+        * vsep (default=0): float or sequence of float
+            The vertical spacing between panels in adjacent rows,
+            either a single length or one length for each of the gaps
+            between rows from top to bottom.
+
+        * padleft, padright, padtop, padbottom (default=0): float
+            The spacing between each edge of the figure and the nearest
+            panels.
+
+        * units (default='mm'): str or Unit
+            The units of measure the other arguments are specified in.
+            This can be one of 'mm', 'cm', or 'inches', or the
+            equivalent `Unit`.
+
+        * quantum, snap (default=None): float
+            Round all lengths to a whole number of a quantum, or to
+            whole device units at a resolution, as for
+            `PanelSizeLocator`.
+
+        """
+        self._layout_cache = self._panels_cache = None
+        self.columnwidths = tuple(columnwidths)
+        self.rowheights = tuple(rowheights)
+        self.hsep = _as_gaps(hsep)
+        self.vsep = _as_gaps(vsep)
+        self.padleft = padleft
+        self.padright = padright
+        self.padtop = padtop
+        self.padbottom = padbottom
+        self.units = units
+        self.quantum = _snap_quantum(snap, quantum, units)
+        # Check the separations match the number of rows and columns:
+        self._lengths()
+
+    def __setattr__(self, name, value):
+        # Any change to the parameters defining the geometry invalidates
+        # the cached layout and panels, they will be recomputed on next
+        # access:
+        object.__setattr__(self, name, value)
+        if name in _GRID_GEOMETRY_ATTRIBUTES:
+            object.__setattr__(self, '_layout_cache', None)
+            object.__setattr__(self, '_panels_cache', None)
+
+    def frozen(self):
+        """
+        Returns an immutable and hashable copy of the locator, either a
+        `FrozenGridSizeLocator` or a `FrozenGridFigureSizeLocator`.
+
+        """
+        if isinstance(self, GridFigureSizeLocator):
+            cls = FrozenGridFigureSizeLocator
+        else:
+            cls = FrozenGridSizeLocator
+        return _rebuild_frozen(cls, self._parameters())
+
+
+class GridFigureSizeLocator(GridSizeLocator):
+    """A grid locator based on total figure size and size ratios."""
+
+    def __init__(self, widthratios, heightratios, figwidth=None,
+                 figheight=None, panelratio=None, hsep=0, vsep=0, padleft=0,
+                 padright=0, padtop=0, padbottom=0, units='mm',
+                 quantum=None, snap=None):
+        """
+        Initialize a grid locator based on total figure size, where the
+        panel sizes in each column and row are in given ratios. You must
+        at a minimum specify the width or the height of the figure.
+
+        Arguments:
+
+        * widthratios: sequence of float
+            The relative widths of the columns, from left to right.
+
+        * heightratios: sequence of float
+            The relative heights of the rows, from top to bottom.
+
+        Keyword arguments:
+
+        * figwidth (no default): float
+            The total width of the figure.
+
+        * figheight (no default): float
+            The total height of the figure.
+
+        * panelratio (default=1): float
+            The width/height ratio of a panel whose width and height
+            ratios are both 1. This argument is used to determine the
+            panel sizes when only one of the `figwidth` or `figheight`
+            keyword arguments is present, and is ignored if both are
+            given.
+
+        * hsep, vsep, padleft, padright, padtop, padbottom, units,
+          quantum:
+            As for `GridSizeLocator`.
+
+        * snap (default=None): float
+            As for `GridSizeLocator`. Any prescribed figure size is kept,
+            rounded to device units, by rounding the panels down and
+            giving the device units left over to the right and bottom
+            padding.
+
+        """
+        columnwidths, rowheights = self.panel_sizes(
+            widthratios, heightratios, figwidth=figwidth,
+            figheight=figheight, panelratio=panelratio, hsep=hsep, vsep=vsep,
+            padleft=padleft, padright=padright, padtop=padtop,
+            padbottom=padbottom)
+        quantum = _snap_quantum(snap, quantum, units)
+        if snap is not None:
+            columnwidths, rowheights, padright, padbottom = _snap_grid_figure(
+                figwidth, figheight, columnwidths, rowheights, hsep, vsep,
+                padleft, padright, padtop, padbottom, quantum)
+        super(GridFigureSizeLocator, self).__init__(
+            columnwidths, rowheights, hsep=hsep, vsep=vsep, padleft=padleft,
+            padright=padright, padtop=padtop, padbottom=padbottom,
+            units=units, quantum=quantum)
+
+    @staticmethod
+    def panel_sizes(widthratios, heightratios, figwidth=None, figheight=None,
+                    panelratio=None, hsep=0, vsep=0, padleft=0, padright=0,
+                    padtop=0, padbottom=0):
+        """
+        Determine the column widths and row heights for a fixed figure
+        size. This is the equivalent of `FigureSizeLocator.panel_size`,
+        with the sum of the ratios in place of the numbers of columns
+        and rows. The arguments are the same as for the constructor.
+
+        Returns:
+
+        * columnwidths, rowheights: tuple of float
+            The width of each column and the height of each row.
+
+        """
+        if figwidth is None and figheight is None:
+            raise ValueError('one or both of the "figwidth" and "figheight" '
+                             'keywords must be used')
+        if figwidth is not None and figheight is not None:
+            if panelratio is not None:
+                msg = ('the "panelratio" keyword is ignored when both the '
+                       '"figwidth" and "figheight" keywords are used')
+                warnings.warn(msg)
+        widthratios = tuple(widthratios)
+        heightratios = tuple(heightratios)
+        if figwidth is not None:
+            unitwidth = (figwidth - sum(_per_gap(hsep, len(widthratios) - 1,
+                                                 'hsep')) -
+                         padleft - padright) / sum(widthratios)
+            if unitwidth <= 0:
+                msg = ('the specified figure width is not wide enough to '
+                       'locate panels with the desired separation and '
+                       'padding')
+                raise ValueError(msg)
+        if figheight is not None:
+            unitheight = (figheight - sum(_per_gap(vsep, len(heightratios) - 1,
+                                                   'vsep')) -
+                          padtop - padbottom) / sum(heightratios)
+            if unitheight <= 0:
+                msg = ('the specified figure height is not tall enough to '
+                       'locate panels with the desired separation and '
+                       'padding')
+                raise ValueError(msg)
+        if figwidth is None:
+            unitwidth = unitheight * (panelratio or 1.)
+        elif figheight is None:
+            unitheight = unitwidth / (panelratio or 1.)
+        return (tuple(unitwidth * ratio for ratio in widthratios),
+                tuple(unitheight * ratio for ratio in heightratios))
+
+
+class FrozenGridSizeLocator(_GridBase, _FrozenLocatorBase):
+    """An immutable and hashable grid locator based on panel sizes."""
+
+    __slots__ = _GRID_PARAMETERS + ('_layout_cache', '_panels_cache')
+
+    def __init__(self, columnwidths, rowheights, hsep=0, vsep=0, padleft=0,
+                 padright=0, padtop=0, padbottom=0, units='mm',
+                 quantum=None, snap=None):
+        """
+        Initialize an immutable grid locator based on panel sizes. The
+        arguments are the same as for `GridSizeLocator`.
+
+        """
+        quantum = _snap_quantum(snap, quantum, units)
+        _set_frozen_parameters(self, (tuple(columnwidths), tuple(rowheights),
+                                      _as_gaps(hsep), _as_gaps(vsep), padleft,
+                                      padright, padtop, padbottom, units,
+                                      quantum))
+        self._lengths()
+
+
+class FrozenGridFigureSizeLocator(FrozenGridSizeLocator):
+    """An immutable and hashable grid locator based on figure size."""
+
+    __slots__ = ()
+
+    def __init__(self, widthratios, heightratios, figwidth=None,
+                 figheight=None, panelratio=None, hsep=0, vsep=0, padleft=0,
+                 padright=0, padtop=0, padbottom=0, units='mm',
+                 quantum=None, snap=None):
+        """
+        Initialize an immutable grid locator based on total figure size.
+        The arguments are the same as for `GridFigureSizeLocator`.
+
+        """
+        columnwidths, rowheights = GridFigureSizeLocator.panel_sizes(
+            widthratios, heightratios, figwidth=figwidth,
+            figheight=figheight, panelratio=panelratio, hsep=hsep, vsep=vsep,
+            padleft=padleft, padright=padright, padtop=padtop,
+            padbottom=padbottom)
+        quantum = _snap_quantum(snap, quantum, units)
+        if snap is not None:
+            columnwidths, rowheights, padright, padbottom = _snap_grid_figure(
+                figwidth, figheight, columnwidths, rowheights, hsep, vsep,
+                padleft, padright, padtop, padbottom, quantum)
+        super(FrozenGridFigureSizeLocator, self).__init__(
+            columnwidths, rowheights, hsep=hsep, vsep=vsep, padleft=padleft,
+            padright=padright, padtop=padtop, padbottom=padbottom,
+            units=units, quantum=quantum)
+
+
+def _as_gaps(sep):
+    """Store a separation as a number or as a tuple of lengths per gap."""
+    if isinstance(sep, Number):
+        return sep
+    return tuple(sep)
+
+
+def _per_gap(sep, count, name):
+    """Expand a separation to a tuple with one length for each gap."""
+    if isinstance(sep, Number):
+        return (sep,) * count
+    sep = tuple(sep)
+    if len(sep) != count:
+        raise ValueError('"{}" must have {} lengths, one for each gap, got '
+                         '{}'.format(name, count, len(sep)))
+    return sep
+
+
+def _snap_grid_figure(figwidth, figheight, columnwidths, rowheights, hsep,
+                      vsep, padleft, padright, padtop, padbottom, quantum):
+    """
+    Snap the panel sizes of a grid figure size locator to whole quanta,
+    keeping each prescribed figure dimension by giving the quanta left
+    over to the right or bottom padding.
+
+    Returns the column widths, row heights and the right and bottom
+    padding.
+
+    """
+    if figwidth is not None:
+        columnwidths, padright = _fill_grid_quanta(
+            figwidth, columnwidths, _per_gap(hsep, len(columnwidths) - 1,
+                                             'hsep'),
+            padleft, padright, quantum)
+    if figheight is not None:
+        rowheights, padbottom = _fill_grid_quanta(
+            figheight, rowheights, _per_gap(vsep, len(rowheights) - 1,
+                                            'vsep'),
+            padtop, padbottom, quantum)
+    return columnwidths, rowheights, padright, padbottom
+
+
+def _fill_grid_quanta(length, sizes, seps, padstart, padend, quantum):
+    """
+    Divide a length in whole quanta between panels of different sizes,
+    separations and padding. Each panel gets its share of the quanta
+    available for panels rounded down, and the remainder is added to the
+    end padding.
+
+    """
+    def quanta(x):
+        return int(round(x / quantum))
+    total = quanta(length)
+    fixed = sum(quanta(sep) for sep in seps) + quanta(padstart) + \
+        quanta(padend)
+    available = total - fixed
+    shares = [int(np.floor(available * size / sum(sizes) + 1e-9))
+              for size in sizes]
+    if min(shares) <= 0:
+        raise ValueError('the specified dimensions are not large enough to '
+                         'locate panels on whole device units')
+    padend = quanta(padend) + available - sum(shares)
+    return (tuple(share * quantum for share in shares), padend * quantum)
@@ -18,78 +18,73 @@
 
 from __future__ import (absolute_import, division, print_function)
 
+from collections import namedtuple
+from functools import lru_cache
 from itertools import product
 import warnings
 
-from ._units import convert_units
+import numpy as np
 
+from ._units import convert_units, unit_converter, _normalize_units
 
-class PanelSizeLocator(object):
-    """A panel locator based on panel size."""
 
-    def __init__(self, rows, columns, panelwidth, panelheight,
-                 hsep=0, vsep=0, padleft=0, padright=0, padtop=0,
-                 padbottom=0, units='mm'):
-        """
-        Initialize a locator based on panel size. The sizes can be
-        specified in arbitrary units of length specified via the `units`
-        keyword.
+#: The maximum number of entries held by each of the memoization caches.
+CACHE_SIZE = 1024
 
-        Arguments:
+#: The parameters that define the geometry of a panel locator, in the
+#: order they are accepted by `PanelSizeLocator`.
+_PARAMETERS = ('rows', 'columns', 'panelwidth', 'panelheight', 'hsep', 'vsep',
+               'padleft', 'padright', 'padtop', 'padbottom', 'units',
+               'quantum')
 
-        * rows, columns: int
-            The number of rows and columns making up the figure.
+#: Attributes of a locator that define its geometry, setting any of these
+#: invalidates the cached layout and panels.
+_GEOMETRY_ATTRIBUTES = frozenset(_PARAMETERS)
 
-        * panelwidth, panelheight: float
-            The width and height of the panels making up the figure.
 
-        Keyword arguments:
+#: The cached layout of a locator: the figure size in the locator's units,
+#: the panel size in figure coordinates, and a mapping of figure sizes
+#: keyed by units.
+_Layout = namedtuple('_Layout', ['figwidth', 'figheight', 'panelwidth_fig',
+                                 'panelheight_fig', 'figsizes'])
 
-        * hsep (default=0): float
-            The horizontal spacing between each panel and neighbouring
-            panels in the same row.
+#: The cached panels of a locator: the positions of all panels as an array
+#: and as nested lists, and the edges of the columns and rows. These are
+#: only computed when a panel position is first requested.
+_Panels = namedtuple('_Panels', ['positions', 'table', 'edges'])
 
-        * vsep (default=0): float
-            The vertical spacing between each panel and neighbouring
-            panels in the same column.
+#: The edges of the panels in figure coordinates: the left and right edge
+#: of each column and the bottom and top edge of each row.
+_Edges = namedtuple('_Edges', ['left', 'right', 'bottom', 'top'])
 
-        * padleft (default=0): float
-            The spacing between the left edge of the figure and the left
-            edge of the first column of panels.
 
-        * padright (default=0): float
-            The spacing between the right edge of the figure and the
-            right edge of the last column of panels.
+class _LocatorBase(object):
+    """Geometry shared by all panel locators."""
 
-        * padtop (default=0): float
-            The spacing between the top edge of the figure and the top
-            edge of the first row of panels.
+    __slots__ = ()
 
-        * padbottom (default=0): float
-            The spacing between the bottom edge of the figure and the
-            bottom edge of the last row of panels.
+    #: The names of the parameters defining the geometry of the locator.
+    _parameter_names = _PARAMETERS
 
-        * units (default='mm'): str
-            The units of measure the other arguments are specified in.
-            This can be one of 'mm', 'cm', or 'inches'.
+    @property
+    def figwidth(self):
+        """The width of the figure in the locator's units."""
+        return self._layout().figwidth
 
-        """
-        self.rows, self.columns = rows, columns
-        self.panelwidth = panelwidth
-        self.panelheight = panelheight
-        self.hsep = hsep
-        self.vsep = vsep
-        self.padleft = padleft
-        self.padright = padright
-        self.padtop = padtop
-        self.padbottom = padbottom
-        self.units = units
-        self.figwidth = (self.padleft + self.columns * self.panelwidth +
-                         (self.columns - 1) * self.hsep + self.padright)
-        self.figheight = (self.padtop + self.rows * self.panelheight +
-                          (self.rows - 1) * self.vsep + self.padbottom)
-        self.panelwidth_fig = self.panelwidth / self.figwidth
-        self.panelheight_fig = self.panelheight / self.figheight
+    @property
+    def figheight(self):
+        """The height of the figure in the locator's units."""
+        return self._layout().figheight
+
+    @property
+    def panelwidth_fig(self):
+        """The width of a panel as a fraction of the figure width."""
+        return self._layout().panelwidth_fig
+
+    @property
+    def panelheight_fig(self):
+        """The height of a panel as a fraction of the figure height."""
+        return self._layout().panelheight_fig
 
     @property
     def figsize(self):
@@ -102,13 +97,87 @@ class PanelSizeLocator(object):
 
         Argument:
 
-        * units: string
+        * units: string or Unit
             The units of measure the figure size should be returned in.
-            This can be one of 'mm', 'cm', or 'inches'.
+            This can be one of 'mm', 'cm', or 'inches', or the
+            equivalent `Unit`.
 
         """
-        return (convert_units(self.figwidth, self.units, units),
-                convert_units(self.figheight, self.units, units))
+        layout = self._layout()
+        try:
+            return layout.figsizes[units]
+        except KeyError:
+            converter = unit_converter(self.units, units)
+            figsize = (converter(layout.figwidth),
+                       converter(layout.figheight))
+            layout.figsizes[units] = figsize
+            return figsize
+
+    def figsize_px(self, dpi):
+        """
+        Returns the figure size (width, height) in whole pixels at a
+        given resolution.
+
+        Argument:
+
+        * dpi: float
+            The resolution in dots (pixels) per inch.
+
+        """
+        width, height = self.figsize
+        return int(round(width * dpi)), int(round(height * dpi))
+
+    def panel_pixel_boxes(self, dpi, order='row', flatten=False):
+        """
+        Returns the integer pixel boxes of all panels at a given
+        resolution.
+
+        Each box is (left, top, right, bottom) in pixels measured from
+        the top-left corner of the figure, so the panel occupies
+        `image[top:bottom, left:right]` of an image of the whole figure.
+        Every edge is its exact position at the resolution rounded to the
+        nearest pixel, as is the figure size given by `figsize_px`, so
+        adjacent panels never overlap and each panel is within one pixel
+        of its nominal size. Panels may differ in size by a pixel unless
+        the geometry lands exactly on pixels. Locators constructed with
+        `snap` set to the resolution (or a divisor of it) always do.
+
+        Argument:
+
+        * dpi: float
+            The resolution in dots (pixels) per inch.
+
+        Keyword arguments:
+
+        * order (default='row'): str
+            The order of panels in a flattened array, as for
+            `panel_positions`.
+
+        * flatten (default=False): bool
+            If `False` an array of shape (rows, columns, 4) is returned,
+            otherwise an array of shape (rows * columns, 4).
+
+        """
+        if order not in ('row', 'column'):
+            raise ValueError('the order keyword must be either "row" or "column"')
+        # Scale by the unrounded figure size, rounding only the edges, so
+        # rounding errors do not accumulate across the figure:
+        width, height = self.figsize
+        width, height = width * dpi, height * dpi
+        positions = self.panel_positions()
+        x, y, w, h = (positions[..., i] for i in range(4))
+        boxes = np.stack([x * width, (1 - y - h) * height,
+                          (x + w) * width, (1 - y) * height], axis=-1)
+        boxes = np.rint(boxes).astype(np.intp)
+        # Edges shared by adjacent panels may round differently, make sure
+        # no panel extends into its neighbour:
+        np.minimum(boxes[:, :-1, 2], boxes[:, 1:, 0], out=boxes[:, :-1, 2])
+        np.minimum(boxes[:-1, :, 3], boxes[1:, :, 1], out=boxes[:-1, :, 3])
+        if not flatten:
+            return boxes
+        if order == 'column':
+            boxes = boxes.transpose(1, 0, 2)
+        return boxes.reshape(-1, 4)
 
     def panel_position_iterator(self, order='row'):
         """
@@ -122,6 +191,7 @@ class PanelSizeLocator(object):
             "column" for column-major order (rows then columns).
 
         """
+        table = self._panels().table
         row_gen = range(self.rows)
         col_gen = range(self.columns)
         try:
@@ -129,7 +199,42 @@ class PanelSizeLocator(object):
                               'column': (1, 0, col_gen, row_gen)}[order]
         except KeyError:
             raise ValueError('the order keyword must be either "row" or "column"')
-        return (self.panel_position(x[i0], x[i1]) for x in product(g0, g1))
+        return (tuple(table[x[i0]][x[i1]]) for x in product(g0, g1))
+
+    def panel_positions(self, order='row', flatten=False):
+        """
+        Returns the matplotlib-style (x, y, width, height) positions of
+        all panels in figure coordinates as a single array.
+
+        Keyword arguments:
+
+        * order (default='row'): str
+            The order in which panels appear in a flattened array.
+            Accepted values are "row" for row-major order (columns then
+            rows), or "column" for column-major order (rows then
+            columns).
+
+        * flatten (default=False): bool
+            If `False` an array of shape (rows, columns, 4) is returned,
+            indexed in the same way as `panel_position`. If `True` an
+            array of shape (rows * columns, 4) is returned with panels
+            in the order given by the `order` keyword, matching the
+            order of `panel_position_iterator`.
+
+        The returned array is a read-only view of the locator's cached
+        positions, take a copy if you need to modify it.
+
+        """
+        if order not in ('row', 'column'):
+            raise ValueError('the order keyword must be either "row" or "column"')
+        positions = self._panels().positions
+        if not flatten:
+            return positions
+        if order == 'column':
+            positions = positions.transpose(1, 0, 2)
+        positions = positions.reshape(-1, 4)
+        positions.flags.writeable = False
+        return positions
 
     def panel_position(self, row, column):
         """
@@ -143,12 +248,327 @@ class PanelSizeLocator(object):
            0 in the top-left.
 
         """
-        x = self.padleft + (self.panelwidth + self.hsep) * column
-        y = (self.figheight - self.padtop -
-             self.panelheight * (row + 1) - self.vsep * row)
-        x_fig = x / self.figwidth
-        y_fig = y / self.figheight
-        return (x_fig, y_fig, self.panelwidth_fig, self.panelheight_fig)
+        return tuple(self._panels().table[row][column])
+
+    def span_position(self, rows, columns):
+        """
+        Returns the matplotlib-style (x, y, width, height) position in
+        figure coordinates of a panel spanning several cells of the
+        grid, from the left edge of its first column to the right edge
+        of its last, and from the top of its first row to the bottom of
+        its last.
+
+        Arguments:
+
+        * rows, columns: int or slice
+            The rows and columns spanned by the panel, as an index or a
+            slice with a step of 1, where indices start at 0 in the
+            top-left. For example `span_position(0, slice(0, 2))` spans
+            the first two columns of the first row.
+
+        """
+        r0, r1 = _span(rows, self.rows, 'rows')
+        c0, c1 = _span(columns, self.columns, 'columns')
+        left, right, bottom, top = self._panels().edges
+        x, y = left[c0], bottom[r1 - 1]
+        return (x, y, right[c1 - 1] - x, top[r0] - y)
+
+    def mosaic_positions(self, mosaic):
+        """
+        Returns the positions of panels laid out by an ASCII mosaic.
+
+        The mosaic has one line for each row of the grid and one
+        character for each column. Each character other than '.' labels
+        a panel, which spans the rectangle of cells where its label
+        appears. Cells marked '.' are left empty. For example, on a
+        locator with 2 rows and 3 columns::
+
+            AAB
+            C.B
+
+        places panel A across the first two columns of the first row,
+        panel B down the last column, and panel C in the bottom-left.
+        Mosaics are parsed and validated once and cached, so repeated
+        use of the same mosaic is cheap.
+
+        Argument:
+
+        * mosaic: str or sequence of str
+            The mosaic as a multi-line string, or as one string per row.
+            Leading and trailing whitespace on each line is ignored.
+
+        Returns:
+
+        * positions: dict
+            A mapping of each label to the matplotlib-style (x, y,
+            width, height) position of its panel in figure coordinates,
+            in the order the labels first appear in the mosaic.
+
+        """
+        if not isinstance(mosaic, str):
+            mosaic = '\n'.join(mosaic)
+        shape, spans = _compile_mosaic(mosaic)
+        if shape != (self.rows, self.columns):
+            raise ValueError('the mosaic has {} rows and {} columns, the '
+                             'locator has {} rows and {} columns'.format(
+                                 shape[0], shape[1], self.rows,
+                                 self.columns))
+        left, right, bottom, top = self._panels().edges
+        return {label: (left[c0], bottom[r1 - 1],
+                        right[c1 - 1] - left[c0], top[r0] - bottom[r1 - 1])
+                for label, (r0, r1, c0, c1) in spans}
+
+    def create_axes(self, fig, **kwargs):
+        """
+        Create an axes for every panel in a figure.
+
+        Arguments:
+
+        * fig: matplotlib.figure.Figure
+            The figure to create the axes in.
+
+        Keyword arguments:
+
+        * projection (default=None): str or projection object
+            The projection of the axes, as accepted by
+            `matplotlib.figure.Figure.add_axes`.
+
+        * sharex, sharey (default=None): bool or str
+            Controls sharing of the x and y axes between panels, as for
+            `matplotlib.pyplot.subplots`. This can be `False` or 'none',
+            `True` or 'all', 'row', or 'col'. If not given axes are not
+            shared, unless `label_outer` is used.
+
+        * tick_params (default=None): dict
+            Keyword arguments passed to `tick_params` for every axes.
+
+        * label_outer (default=False): bool
+            If `True` only the outer panels have tick labels, and axes
+            are shared within rows and columns unless sharing is given
+            explicitly. Inner tick labels are only hidden where the axes
+            they label are shared with an outer panel. Spines that
+            coincide with a neighbouring panel are also hidden.
+
+        Any other keyword arguments are passed to the constructor of
+        every axes.
+
+        Returns:
+
+        * axes: numpy.ndarray
+            An object array of shape (rows, columns) containing the axes.
+
+        """
+        from ._axes import create_axes
+        return create_axes(self, fig, **kwargs)
+
+    def _parameters(self):
+        """Return the values of the geometry parameters as a tuple."""
+        return tuple(getattr(self, name) for name in self._parameter_names)
+
+    def _gaps(self):
+        """
+        Return the separations between adjacent columns and between
+        adjacent rows, as tuples of lengths in the same form as
+        `_lengths`.
+
+        """
+        hsep, vsep = self._lengths()[2:4]
+        return (hsep,) * (self.columns - 1), (vsep,) * (self.rows - 1)
+
+    def _subgrid(self, rows, columns):
+        """
+        Return a frozen locator for the first rows and columns of this
+        locator, with the same panel sizes, separation and padding.
+
+        """
+        return _rebuild_frozen(FrozenPanelSizeLocator,
+                               (rows, columns) + self._parameters()[2:])
+
+    def _layout(self):
+        """Return the cached layout, computing it first if required."""
+        layout = self._layout_cache
+        if layout is None:
+            layout = self._compute_layout()
+            object.__setattr__(self, '_layout_cache', layout)
+        return layout
+
+    def _panels(self):
+        """Return the cached panels, computing them first if required."""
+        panels = self._panels_cache
+        if panels is None:
+            positions = self._compute_positions()
+            positions.flags.writeable = False
+            panels = _Panels(positions, positions.tolist(), _edges(positions))
+            object.__setattr__(self, '_panels_cache', panels)
+        return panels
+
+    def _lengths(self):
+        """
+        Return the lengths defining the geometry, as integer multiples
+        of the quantum if one is set, in the order: panel width, panel
+        height, horizontal separation, vertical separation, and left,
+        right, top and bottom padding.
+
+        """
+        lengths = (self.panelwidth, self.panelheight, self.hsep, self.vsep,
+                   self.padleft, self.padright, self.padtop, self.padbottom)
+        if self.quantum is None:
+            return lengths
+        lengths = tuple(int(round(length / self.quantum))
+                        for length in lengths)
+        if lengths[0] < 1 or lengths[1] < 1:
+            raise ValueError('the panel width and height must be at least '
+                             'one quantum')
+        return lengths
+
+    def _extent(self, lengths):
+        """
+        Return the width and height of the figure from the lengths
+        returned by `_lengths`, in the same form as those lengths.
+
+        """
+        (panelwidth, panelheight, hsep, vsep,
+         padleft, padright, padtop, padbottom) = lengths
+        figwidth = (padleft + self.columns * panelwidth +
+                    (self.columns - 1) * hsep + padright)
+        figheight = (padtop + self.rows * panelheight +
+                     (self.rows - 1) * vsep + padbottom)
+        return figwidth, figheight
+
+    def _compute_layout(self):
+        """Compute the figure size and the size of a panel."""
+        lengths = self._lengths()
+        figwidth, figheight = self._extent(lengths)
+        panelwidth_fig = lengths[0] / figwidth
+        panelheight_fig = lengths[1] / figheight
+        if self.quantum is not None:
+            figwidth = figwidth * self.quantum
+            figheight = figheight * self.quantum
+        return _Layout(figwidth, figheight, panelwidth_fig, panelheight_fig,
+                       {})
+
+    def _compute_positions(self):
+        """Compute the position of every panel."""
+        lengths = self._lengths()
+        (panelwidth, panelheight, hsep, vsep,
+         padleft, padright, padtop, padbottom) = lengths
+        figwidth, figheight = self._extent(lengths)
+        # In fixed-point mode all lengths are integers and the arithmetic
+        # below is exact, until the final division by the figure size:
+        dtype = np.float64 if self.quantum is None else np.int64
+        row = np.arange(self.rows, dtype=dtype)[:, np.newaxis]
+        column = np.arange(self.columns, dtype=dtype)[np.newaxis, :]
+        positions = np.empty((self.rows, self.columns, 4), dtype=np.float64)
+        x = padleft + (panelwidth + hsep) * column
+        y = figheight - padtop - panelheight * (row + 1) - vsep * row
+        positions[..., 0] = x / figwidth
+        positions[..., 1] = y / figheight
+        positions[..., 2] = panelwidth / figwidth
+        positions[..., 3] = panelheight / figheight
+        return positions
+
+
+class PanelSizeLocator(_LocatorBase):
+    """A panel locator based on panel size."""
+
+    def __init__(self, rows, columns, panelwidth, panelheight,
+                 hsep=0, vsep=0, padleft=0, padright=0, padtop=0,
+                 padbottom=0, units='mm', quantum=None, snap=None):
+        """
+        Initialize a locator based on panel size. The sizes can be
+        specified in arbitrary units of length specified via the `units`
+        keyword.
+
+        Arguments:
+
+        * rows, columns: int
+            The number of rows and columns making up the figure.
+
+        * panelwidth, panelheight: float
+            The width and height of the panels making up the figure.
+
+        Keyword arguments:
+
+        * hsep (default=0): float
+            The horizontal spacing between each panel and neighbouring
+            panels in the same row.
+
+        * vsep (default=0): float
+            The vertical spacing between each panel and neighbouring
+            panels in the same column.
+
+        * padleft (default=0): float
+            The spacing between the left edge of the figure and the left
+            edge of the first column of panels.
+
+        * padright (default=0): float
+            The spacing between the right edge of the figure and the
+            right edge of the last column of panels.
+
+        * padtop (default=0): float
+            The spacing between the top edge of the figure and the top
+            edge of the first row of panels.
+
+        * padbottom (default=0): float
+            The spacing between the bottom edge of the figure and the
+            bottom edge of the last row of panels.
+
+        * units (default='mm'): str or Unit
+            The units of measure the other arguments are specified in.
+            This can be one of 'mm', 'cm', or 'inches', or the
+            equivalent `Unit`.
+
+        * quantum (default=None): float
+            If given, all lengths are rounded to a whole number of this
+            length (in `units`) and the layout is computed with integer
+            arithmetic, giving exact and reproducible positions. For
+            example `units='mm'` with `quantum=0.001` holds the geometry
+            in integer micrometres. The quantum must be positive, and no
+            larger than the panel width and height.
+
+        * snap (default=None): float
+            If given, a resolution in dots per inch that all lengths are
+            rounded to, so every panel edge and the figure size fall on
+            whole device units. This sets `quantum` to the length of one
+            device unit, and cannot be used with it. Use the resolution
+            of a raster image, or 72 to snap to points for vector output.
+
+        """
+        self._layout_cache = self._panels_cache = None
+        self.rows, self.columns = rows, columns
+        self.panelwidth = panelwidth
+        self.panelheight = panelheight
+        self.hsep = hsep
+        self.vsep = vsep
+        self.padleft = padleft
+        self.padright = padright
+        self.padtop = padtop
+        self.padbottom = padbottom
+        self.units = units
+        self.quantum = _snap_quantum(snap, quantum, units)
+        # Check the panel size is at least one quantum:
+        self._lengths()
+
+    def __setattr__(self, name, value):
+        # Any change to the parameters defining the geometry invalidates
+        # the cached layout and panels, they will be recomputed on next
+        # access:
+        object.__setattr__(self, name, value)
+        if name in _GEOMETRY_ATTRIBUTES:
+            object.__setattr__(self, '_layout_cache', None)
+            object.__setattr__(self, '_panels_cache', None)
+
+    def frozen(self):
+        """
+        Returns an immutable and hashable copy of the locator, either a
+        `FrozenPanelSizeLocator` or a `FrozenFigureSizeLocator`.
+
+        """
+        if isinstance(self, FigureSizeLocator):
+            cls = FrozenFigureSizeLocator
+        else:
+            cls = FrozenPanelSizeLocator
+        return _rebuild_frozen(cls, self._parameters())
 
 
 class FigureSizeLocator(PanelSizeLocator):
@@ -156,7 +576,8 @@ class FigureSizeLocator(PanelSizeLocator):
 
     def __init__(self, rows, columns, figwidth=None, figheight=None,
                  panelratio=None, hsep=0, vsep=0, padleft=0, padright=0,
-                 padtop=0, padbottom=0, units='mm'):
+                 padtop=0, padbottom=0, units='mm', quantum=None,
+                 snap=None):
         """
         Initialize a locator based on total figure size. The sizes can
         be specified in arbitrary units of length specified via the
@@ -207,9 +628,28 @@ class FigureSizeLocator(PanelSizeLocator):
             The spacing between the bottom edge of the figure and the
             bottom edge of the last row of panels.
 
-        * units (default='mm'): str
+        * units (default='mm'): str or Unit
             The units of measure the other arguments are specified in.
-            This can be one of 'mm', 'cm', or 'inches'.
+            This can be one of 'mm', 'cm', or 'inches', or the
+            equivalent `Unit`.
+
+        * quantum (default=None): float
+            If given, all lengths are rounded to a whole number of this
+            length (in `units`) and the layout is computed with integer
+            arithmetic, giving exact and reproducible positions. For
+            example `units='mm'` with `quantum=0.001` holds the geometry
+            in integer micrometres. The quantum must be positive, and no
+            larger than the panel width and height.
+
+        * snap (default=None): float
+            If given, a resolution in dots per inch that all lengths are
+            rounded to, so every panel edge and the figure size fall on
+            whole device units. This sets `quantum` to the length of one
+            device unit, and cannot be used with it. Use the resolution
+            of a raster image, or 72 to snap to points for vector output.
+            Any prescribed figure size is kept, rounded to device units,
+            by giving the device units left over after rounding the
+            panels to the right and bottom padding.
 
         """
         # Compute the panel size that fits with the figure size specification:
@@ -217,11 +657,16 @@ class FigureSizeLocator(PanelSizeLocator):
             rows, columns, figwidth=figwidth, figheight=figheight,
             panelratio=panelratio, hsep=hsep, vsep=vsep, padleft=padleft,
             padright=padright, padtop=padtop, padbottom=padbottom)
+        quantum = _snap_quantum(snap, quantum, units)
+        if snap is not None:
+            panelwidth, panelheight, padright, padbottom = _snap_figure(
+                rows, columns, figwidth, figheight, panelwidth, panelheight,
+                hsep, vsep, padleft, padright, padtop, padbottom, quantum)
         # Call the PanelSizeLocator constructor:
         super(FigureSizeLocator, self).__init__(
             rows, columns, panelwidth, panelheight, hsep=hsep, vsep=vsep,
             padleft=padleft, padright=padright, padtop=padtop,
-            padbottom=padbottom, units=units)
+            padbottom=padbottom, units=units, quantum=quantum)
 
     @staticmethod
     def panel_size(rows, columns, figwidth=None, figheight=None,
@@ -279,40 +724,339 @@ class FigureSizeLocator(PanelSizeLocator):
             raise ValueError('one or both of the "figwidth" and "figheight" '
                              'keywords must be used')
         if figwidth is not None and figheight is not None:
-            # Both width and height are prescribed, choose the panel size
-            # appropriately (ignoring any specified aspect ratio):
             if panelratio is not None:
                 msg = ('the "panelratio" keyword is ignored when both the '
                        '"figwidth" and "figheight" keywords are used')
                 warnings.warn(msg)
-            panelwidth = (figwidth - (columns - 1) * hsep - padleft -
-                          padright) / float(columns)
-            panelheight = (figheight - (rows - 1) * vsep - padtop -
-                           padbottom) / float(rows)
-            if panelwidth <=0 or panelheight <= 0:
-                msg = ('the specified dimensions are not large enough to'
-                       'locate panels with the desired separation and padding')
-                raise ValueError(msg)
-        elif figwidth is None:
-            # Only the figure height is prescribed, choose the panel height
-            # appropriately and determine the panel width from the aspect
-            # ratio:
-            panelheight = (figheight - (rows - 1) * vsep - padtop -
-                           padbottom) / float(rows)
-            if panelheight <= 0:
-                msg = ('the specified figure height is not tall enough to '
-                       'locate panels with the desired separation and padding')
-                raise ValueError(msg)
-            panelwidth = panelheight * (panelratio or 1.)
-        elif figheight is None:
-            # Only the figure width is prescribed, choose the panel width
-            # appropriately and determine the panel height from the aspect
-            # ratio:
-            panelwidth = (figwidth - (columns - 1) * hsep - padleft -
-                          padright) / float(columns)
-            if panelwidth <= 0:
-                msg = ('the specified figure width is not wide enough to '
-                       'locate panels with the desired separation and padding')
-                raise ValueError(msg)
-            panelheight = panelwidth / (panelratio or 1.)
-        return panelwidth, panelheight
+                panelratio = None
+        arguments = (rows, columns, figwidth, figheight, panelratio, hsep,
+                     vsep, padleft, padright, padtop, padbottom)
+        try:
+            return _solve_panel_size(*arguments)
+        except TypeError:
+            # Unhashable arguments cannot be memoized, solve directly
+            # instead:
+            return _solve_panel_size.__wrapped__(*arguments)
+
+
+class _FrozenLocatorBase(_LocatorBase):
+    """Immutability, equality and hashing shared by frozen locators."""
+
+    __slots__ = ()
+
+    @classmethod
+    def cached(cls, *args, **kwargs):
+        """
+        Returns a frozen locator constructed from the given arguments,
+        reusing an identical locator (including its computed layout)
+        if one was constructed recently. The arguments are the same as
+        for the class constructor.
+
+        Any warnings are only issued when the locator is first
+        constructed.
+
+        """
+        return _cached_locator(cls, args, tuple(sorted(kwargs.items())))
+
+    def frozen(self):
+        """Returns the locator itself, it is already immutable."""
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def _key(self):
+        # In fixed-point mode locators are compared by their integer
+        # geometry, rather than the lengths they were specified with:
+        return ((self.rows, self.columns) + self._lengths() +
+                (_normalize_units(self.units), self.quantum))
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __hash__(self):
+        return hash((type(self).__name__,) + self._key())
+
+    def __repr__(self):
+        arguments = ' '.join('{}={!r}'.format(name, value) for name, value
+                             in zip(self._parameter_names, self._parameters()))
+        return '<{} {}>'.format(type(self).__name__, arguments)
+
+    def __reduce__(self):
+        return (_rebuild_frozen, (type(self), self._parameters()))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class FrozenPanelSizeLocator(_FrozenLocatorBase):
+    """An immutable and hashable panel locator based on panel size."""
+
+    __slots__ = _PARAMETERS + ('_layout_cache', '_panels_cache')
+
+    def __init__(self, rows, columns, panelwidth, panelheight,
+                 hsep=0, vsep=0, padleft=0, padright=0, padtop=0,
+                 padbottom=0, units='mm', quantum=None, snap=None):
+        """
+        Initialize an immutable locator based on panel size. The
+        arguments are the same as for `PanelSizeLocator`.
+
+        Frozen locators cannot be modified after construction. They
+        compare equal when their geometry is the same, and can be used
+        as dictionary keys.
+
+        """
+        quantum = _snap_quantum(snap, quantum, units)
+        _set_frozen_parameters(self, (rows, columns, panelwidth, panelheight,
+                                      hsep, vsep, padleft, padright, padtop,
+                                      padbottom, units, quantum))
+        self._lengths()
+
+
+class FrozenFigureSizeLocator(FrozenPanelSizeLocator):
+    """An immutable and hashable panel locator based on figure size."""
+
+    __slots__ = ()
+
+    def __init__(self, rows, columns, figwidth=None, figheight=None,
+                 panelratio=None, hsep=0, vsep=0, padleft=0, padright=0,
+                 padtop=0, padbottom=0, units='mm', quantum=None,
+                 snap=None):
+        """
+        Initialize an immutable locator based on total figure size. The
+        arguments are the same as for `FigureSizeLocator`.
+
+        """
+        panelwidth, panelheight = FigureSizeLocator.panel_size(
+            rows, columns, figwidth=figwidth, figheight=figheight,
+            panelratio=panelratio, hsep=hsep, vsep=vsep, padleft=padleft,
+            padright=padright, padtop=padtop, padbottom=padbottom)
+        quantum = _snap_quantum(snap, quantum, units)
+        if snap is not None:
+            panelwidth, panelheight, padright, padbottom = _snap_figure(
+                rows, columns, figwidth, figheight, panelwidth, panelheight,
+                hsep, vsep, padleft, padright, padtop, padbottom, quantum)
+        super(FrozenFigureSizeLocator, self).__init__(
+            rows, columns, panelwidth, panelheight, hsep=hsep, vsep=vsep,
+            padleft=padleft, padright=padright, padtop=padtop,
+            padbottom=padbottom, units=units, quantum=quantum)
+
+
+def _set_frozen_parameters(locator, parameters):
+    """Set the geometry parameters of a frozen locator."""
+    for name, value in zip(locator._parameter_names, parameters):
+        object.__setattr__(locator, name, value)
+    object.__setattr__(locator, '_layout_cache', None)
+    object.__setattr__(locator, '_panels_cache', None)
+
+
+def _rebuild_frozen(cls, parameters):
+    """Create a frozen locator directly from its geometry parameters."""
+    locator = cls.__new__(cls)
+    _set_frozen_parameters(locator, parameters)
+    return locator
+
+
+def _snap_quantum(snap, quantum, units):
+    """
+    The quantum of a locator, which is the length of one device unit at
+    the resolution `snap` if it is given.
+
+    """
+    if snap is None:
+        if quantum is not None and quantum <= 0:
+            raise ValueError('the quantum must be positive')
+        return quantum
+    if quantum is not None:
+        raise ValueError('the "snap" and "quantum" keywords cannot both '
+                         'be used')
+    if snap <= 0:
+        raise ValueError('the "snap" resolution must be positive')
+    return convert_units(1. / snap, 'inches', units)
+
+
+def _snap_figure(rows, columns, figwidth, figheight, panelwidth, panelheight,
+                 hsep, vsep, padleft, padright, padtop, padbottom, quantum):
+    """
+    Snap the panel size of a figure size locator to whole quanta,
+    keeping each prescribed figure dimension by giving the quanta left
+    over to the right or bottom padding.
+
+    Returns the panel width and height and the right and bottom padding.
+
+    """
+    panelratio = panelwidth / panelheight
+    if figwidth is not None:
+        panelwidth, padright = _fill_quanta(figwidth, columns, hsep, padleft,
+                                            padright, quantum)
+    if figheight is None:
+        # The panel height follows from the snapped panel width, and is
+        # rounded along with everything else:
+        panelheight = panelwidth / panelratio
+    else:
+        panelheight, padbottom = _fill_quanta(figheight, rows, vsep, padtop,
+                                              padbottom, quantum)
+        if figwidth is None:
+            panelwidth = panelheight * panelratio
+    return panelwidth, panelheight, padright, padbottom
+
+
+def _fill_quanta(length, count, sep, padstart, padend, quantum):
+    """
+    Divide a length in whole quanta between panels, separations and
+    padding. Panels are rounded down, and the remainder is added to the
+    end padding.
+
+    """
+    def quanta(x):
+        return int(round(x / quantum))
+    total = quanta(length)
+    fixed = (count - 1) * quanta(sep) + quanta(padstart) + quanta(padend)
+    panel = (total - fixed) // count
+    if panel <= 0:
+        raise ValueError('the specified dimensions are not large enough to '
+                         'locate panels on whole device units')
+    padend = quanta(padend) + total - fixed - count * panel
+    return panel * quantum, padend * quantum
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _solve_panel_size(rows, columns, figwidth, figheight, panelratio, hsep,
+                      vsep, padleft, padright, padtop, padbottom):
+    """
+    Memoized solution of `FigureSizeLocator.panel_size`, the arguments
+    must already have been validated.
+
+    """
+    if figwidth is not None and figheight is not None:
+        # Both width and height are prescribed, choose the panel size
+        # appropriately (ignoring any specified aspect ratio):
+        panelwidth = (figwidth - (columns - 1) * hsep - padleft -
+                      padright) / float(columns)
+        panelheight = (figheight - (rows - 1) * vsep - padtop -
+                       padbottom) / float(rows)
+        if panelwidth <=0 or panelheight <= 0:
+            msg = ('the specified dimensions are not large enough to'
+                   'locate panels with the desired separation and padding')
+            raise ValueError(msg)
+    elif figwidth is None:
+        # Only the figure height is prescribed, choose the panel height
+        # appropriately and determine the panel width from the aspect
+        # ratio:
+        panelheight = (figheight - (rows - 1) * vsep - padtop -
+                       padbottom) / float(rows)
+        if panelheight <= 0:
+            msg = ('the specified figure height is not tall enough to '
+                   'locate panels with the desired separation and padding')
+            raise ValueError(msg)
+        panelwidth = panelheight * (panelratio or 1.)
+    elif figheight is None:
+        # Only the figure width is prescribed, choose the panel width
+        # appropriately and determine the panel height from the aspect
+        # ratio:
+        panelwidth = (figwidth - (columns - 1) * hsep - padleft -
+                      padright) / float(columns)
+        if panelwidth <= 0:
+            msg = ('the specified figure width is not wide enough to '
+                   'locate panels with the desired separation and padding')
+            raise ValueError(msg)
+        panelheight = panelwidth / (panelratio or 1.)
+    return panelwidth, panelheight
+
+
+def _edges(positions):
+    """The edges of the columns and rows of an array of positions."""
+    left = positions[0, :, 0]
+    bottom = positions[:, 0, 1]
+    return _Edges(left.tolist(), (left + positions[0, :, 2]).tolist(),
+                  bottom.tolist(), (bottom + positions[:, 0, 3]).tolist())
+
+
+def _span(index, count, name):
+    """The start and stop of an index or slice spanning rows or columns."""
+    if isinstance(index, slice):
+        start, stop, step = index.indices(count)
+        if step != 1:
+            raise ValueError('a span of {} must have a step of 1'.format(name))
+    else:
+        start = range(count)[index]
+        stop = start + 1
+    if stop <= start:
+        raise ValueError('a span must include at least one of the '
+                         '{}'.format(name))
+    return start, stop
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_mosaic(mosaic):
+    """
+    Memoized parsing of an ASCII mosaic, returning its shape (rows,
+    columns) and a tuple of the label and the (first row, stop row,
+    first column, stop column) span of each panel.
+
+    """
+    lines = [line.strip() for line in mosaic.strip().splitlines()]
+    if not lines or not lines[0]:
+        raise ValueError('the mosaic is empty')
+    columns = len(lines[0])
+    if any(len(line) != columns for line in lines):
+        raise ValueError('every row of the mosaic must have the same '
+                         'number of columns')
+    cells = {}
+    for row, line in enumerate(lines):
+        for column, label in enumerate(line):
+            if label != '.':
+                cells.setdefault(label, []).append((row, column))
+    spans = []
+    for label, where in cells.items():
+        rows = [row for row, _ in where]
+        cols = [column for _, column in where]
+        r0, r1, c0, c1 = min(rows), max(rows) + 1, min(cols), max(cols) + 1
+        if len(where) != (r1 - r0) * (c1 - c0):
+            raise ValueError('panel {!r} of the mosaic is not a '
+                             'rectangle'.format(label))
+        spans.append((label, (r0, r1, c0, c1)))
+    return (len(lines), columns), tuple(spans)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached_locator(cls, args, kwargs):
+    """Memoized construction of frozen locators."""
+    return cls(*args, **dict(kwargs))
+
+
+def locator_cache_info():
+    """
+    Returns statistics for the memoization caches as a dictionary
+    mapping cache names to `functools.lru_cache` style `CacheInfo`
+    tuples, with fields `hits`, `misses`, `maxsize` and `currsize`.
+
+    The caches are "panel_size", used by `FigureSizeLocator.panel_size`,
+    "locator", used by the `cached` constructor of frozen locators, and
+    "mosaic", used by `mosaic_positions` to hold parsed mosaics.
+
+    """
+    return {'panel_size': _solve_panel_size.cache_info(),
+            'locator': _cached_locator.cache_info(),
+            'mosaic': _compile_mosaic.cache_info()}
+
+
+def clear_locator_caches():
+    """Clear the memoization caches and reset their statistics."""
+    _solve_panel_size.cache_clear()
+    _cached_locator.cache_clear()
+    _compile_mosaic.cache_clear()
@@ -0,0 +1,182 @@
+"""Image mosaics assembled from panel locator geometry."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+
+def image_mosaic(locator, images, dpi, order='row', background=0, out=None):
+    """
+    Assemble one image per panel into a single image of the whole
+    figure, with the padding and separation of the locator.
+
+    Each image is copied directly into its panel's pixel box (see
+    `panel_pixel_boxes`), images that are not the size of their box are
+    resampled to it with nearest-neighbour interpolation. When the
+    images are given as one array and the panels form a regular pixel
+    grid, all images are copied with a single vectorized assignment.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator defining the panel positions.
+
+    * images: array_like
+        A sequence of 2-dimensional (height, width) or 3-dimensional
+        (height, width, channels) arrays, one for each panel in the
+        order given by `order`, or a single array stacking these along
+        its first dimension. There may be fewer images than panels.
+
+    * dpi: float
+        The resolution of the mosaic in dots (pixels) per inch.
+
+    Keyword arguments:
+
+    * order (default='row'): str
+        The order panels are filled in, either "row" for row-major
+        order or "column" for column-major order.
+
+    * background (default=0): scalar or array_like
+        The value of pixels outside of the panels, broadcast against
+        the trailing (channel) dimension of the images.
+
+    * out (default=None): numpy.ndarray
+        An array to assemble the mosaic in, with shape (height, width)
+        or (height, width, channels) matching the figure size in pixels,
+        a `ValueError` is raised if its size does not match. If not
+        given a new array with the data type of the first image is
+        allocated.
+
+    Returns:
+
+    * mosaic: numpy.ndarray
+        The assembled image, row 0 is the top of the figure.
+
+    """
+    boxes = locator.panel_pixel_boxes(dpi, order=order, flatten=True)
+    if isinstance(images, np.ndarray):
+        stacked = images
+    else:
+        images = [np.asarray(image) for image in images]
+        stacked = None
+    if len(images) > len(boxes):
+        raise ValueError('more images than panels')
+    width, height = locator.figsize_px(dpi)
+    if out is None:
+        if not len(images):
+            raise ValueError('at least one image is required to determine '
+                             'the shape of the mosaic')
+        shape = (height, width) + images[0].shape[2:]
+        out = np.empty(shape, dtype=images[0].dtype)
+    elif out.shape[:2] != (height, width):
+        raise ValueError('out must have {} rows and {} columns, got '
+                         'shape {}'.format(height, width, out.shape))
+    out[...] = background
+    if stacked is not None and len(stacked) == len(boxes):
+        view = _grid_view(out, locator.panel_pixel_boxes(dpi))
+        if view is not None and stacked.shape[1:3] == view.shape[2:4]:
+            grid_shape = (locator.rows, locator.columns)
+            if order == 'column':
+                stacked = stacked.reshape(grid_shape[::-1] + stacked.shape[1:])
+                view[...] = stacked.swapaxes(0, 1)
+            else:
+                view[...] = stacked.reshape(grid_shape + stacked.shape[1:])
+            return out
+    for image, (left, top, right, bottom) in zip(images, boxes):
+        out[top:bottom, left:right] = _fit(image, bottom - top, right - left)
+    return out
+
+
+def figimage_mosaic(locator, fig, images, order='row', background=0,
+                    **kwargs):
+    """
+    Draw one image per panel as a single figure image.
+
+    The images are assembled with `image_mosaic` at the resolution of
+    the figure, and drawn with one call to `figimage`. The figure should
+    have the size given by the locator's `figsize`.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator defining the panel positions.
+
+    * fig: matplotlib.figure.Figure
+        The figure to draw in.
+
+    * images: array_like
+        The images for each panel, as for `image_mosaic`.
+
+    Keyword arguments:
+
+    * order (default='row'): str
+        The order panels are filled in, as for `image_mosaic`.
+
+    * background (default=0): scalar or array_like
+        The value of pixels outside of the panels.
+
+    Any other keyword arguments are passed to `figimage`.
+
+    Returns:
+
+    * image: matplotlib.image.FigureImage
+        The figure image.
+
+    """
+    mosaic = image_mosaic(locator, images, fig.dpi, order=order,
+                          background=background)
+    return fig.figimage(mosaic, origin='upper', **kwargs)
+
+
+def _grid_view(out, boxes):
+    """
+    A strided view of `out` with shape (rows, columns, height, width,
+    ...) covering the panel boxes, or `None` if the boxes are not all
+    the same size on a regular pitch.
+
+    """
+    left, top, right, bottom = (boxes[..., i] for i in range(4))
+    width = right - left
+    height = bottom - top
+    if (width != width[0, 0]).any() or (height != height[0, 0]).any():
+        return None
+    xpitch = np.diff(left, axis=1)
+    ypitch = np.diff(top, axis=0)
+    if xpitch.size and (xpitch != xpitch[0, 0]).any():
+        return None
+    if ypitch.size and (ypitch != ypitch[0, 0]).any():
+        return None
+    xpitch = xpitch[0, 0] if xpitch.size else 0
+    ypitch = ypitch[0, 0] if ypitch.size else 0
+    origin = out[top[0, 0]:, left[0, 0]:]
+    shape = boxes.shape[:2] + (height[0, 0], width[0, 0]) + out.shape[2:]
+    strides = ((ypitch * out.strides[0], xpitch * out.strides[1]) +
+               out.strides)
+    return as_strided(origin, shape=shape, strides=strides)
+
+
+def _fit(image, height, width):
+    """Resample an image to a given size by nearest-neighbour lookup."""
+    if image.shape[:2] == (height, width):
+        return image
+    rows = (np.arange(height) + 0.5) * image.shape[0] // height
+    columns = (np.arange(width) + 0.5) * image.shape[1] // width
+    return image[rows.astype(np.intp)[:, np.newaxis],
+                 columns.astype(np.intp)]
@@ -0,0 +1,191 @@
+"""Locators nested inside the panels of other locators."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import numpy as np
+
+
+class NestedLocator(object):
+    """A locator with other locators nested inside some of its panels."""
+
+    def __init__(self, locator, children):
+        """
+        Initialize a nested locator from an outer locator and the
+        locators to place inside some of its panels.
+
+        Each inner locator is scaled to fill the panel it is placed in,
+        so only its proportions are used: its padding and separations
+        keep their share of its own figure size. A nested panel is
+        replaced by the panels of its inner locator.
+
+        The whole tree is compiled once, when the nested locator is
+        constructed, into one array of absolute panel positions in
+        figure coordinates, so looking up a position never walks the
+        tree. Every panel has a hierarchical index, the (row, column)
+        of the outer panel followed by the (row, column) of the panel
+        in each inner locator it is nested in.
+
+        Arguments:
+
+        * locator: PanelSizeLocator, FigureSizeLocator or GridSizeLocator
+            The outer locator, which defines the figure size.
+
+        * children: dict
+            A mapping of (row, column) panels of the outer locator to
+            the locator to place inside each of them, which may be a
+            panel locator or another `NestedLocator`.
+
+        Example::
+
+            outer = FigureSizeLocator(2, 4, figwidth=180, hsep=5, vsep=5)
+            inner = PanelSizeLocator(2, 2, 10, 10, hsep=1, vsep=1)
+            nested = NestedLocator(outer, {(0, 3): inner})
+            nested.panel_position(0, 3, 1, 1)
+
+        """
+        self.locator = locator.frozen()
+        self.children = {tuple(cell): child.frozen()
+                         for cell, child in children.items()}
+        for row, column in self.children:
+            if not (0 <= row < self.locator.rows and
+                    0 <= column < self.locator.columns):
+                raise ValueError('panel ({}, {}) is outside the outer '
+                                 'locator'.format(row, column))
+        self._positions, self._indices = _compile(self.locator,
+                                                  self.children)
+        self._positions.flags.writeable = False
+        self._table = self._positions.tolist()
+        self._lookup = {index: i for i, index in enumerate(self._indices)}
+
+    def frozen(self):
+        """Returns the nested locator itself, it is already immutable."""
+        return self
+
+    def __len__(self):
+        return len(self._indices)
+
+    @property
+    def figsize(self):
+        """The figure size (width, height) in inches."""
+        return self.locator.figsize
+
+    def figsize_in(self, units):
+        """
+        Returns the figure size (width, height) in a specified unit, as
+        for the outer locator.
+
+        """
+        return self.locator.figsize_in(units)
+
+    @property
+    def indices(self):
+        """
+        The hierarchical index of every panel, as a tuple in the order of
+        `panel_positions`.
+
+        """
+        return self._indices
+
+    def panel_positions(self):
+        """
+        Returns the matplotlib-style (x, y, width, height) position of
+        every panel in figure coordinates, as a read-only array of shape
+        (panels, 4) in the order of `indices`. Panels are ordered by the
+        row-major order of the outer locator, with the panels of a
+        nested locator in place of the panel they are nested in.
+
+        """
+        return self._positions
+
+    def panel_position(self, *index):
+        """
+        Returns the matplotlib-style (x, y, width, height) position of
+        a panel in figure coordinates.
+
+        Arguments:
+
+        * index: int
+            The hierarchical index of the panel, for example
+            `panel_position(0, 3, 1, 1)` for the bottom-right panel of a
+            2x2 locator nested in panel (0, 3) of the outer locator.
+
+        """
+        try:
+            return tuple(self._table[self._lookup[index]])
+        except KeyError:
+            raise KeyError('there is no panel with index {}'.format(index))
+
+    def create_axes(self, fig, **kwargs):
+        """
+        Create an axes for every panel.
+
+        Arguments:
+
+        * fig: matplotlib.figure.Figure
+            The figure to add the axes to.
+
+        Any keyword arguments are passed to `fig.add_axes` for each axes.
+
+        Returns:
+
+        * axes: dict
+            A mapping of the hierarchical index of each panel to its
+            axes, in the order of `indices`.
+
+        """
+        return {index: fig.add_axes(position, **kwargs)
+                for index, position in zip(self._indices, self._table)}
+
+
+def _compile(locator, children):
+    """
+    Flatten a locator and its nested children into an array of panel
+    positions relative to the locator's figure and a tuple of their
+    hierarchical indices.
+
+    """
+    rows, columns = locator.rows, locator.columns
+    outer = locator.panel_positions().reshape(-1, 4)
+    blocks = []
+    indices = []
+    start = 0
+    for n, (row, column) in enumerate(
+            (row, column) for row in range(rows) for column in range(columns)):
+        child = children.get((row, column))
+        if child is None:
+            continue
+        # Panels of the outer locator before this one are kept as they
+        # are, in one block:
+        blocks.append(outer[start:n])
+        indices.extend(divmod(k, columns) for k in range(start, n))
+        if isinstance(child, NestedLocator):
+            inner, inner_indices = child._positions, child._indices
+        else:
+            inner = child.panel_positions().reshape(-1, 4)
+            inner_indices = [divmod(k, child.columns)
+                             for k in range(child.rows * child.columns)]
+        # Scale the inner positions into the outer panel all at once:
+        x, y, w, h = outer[n]
+        blocks.append(inner * [w, h, w, h] + [x, y, 0, 0])
+        indices.extend((row, column) + tuple(index)
+                       for index in inner_indices)
+        start = n + 1
+    blocks.append(outer[start:])
+    indices.extend(divmod(k, columns) for k in range(start, rows * columns))
+    return np.concatenate(blocks), tuple(indices)
@@ -0,0 +1,118 @@
+"""Splitting a large number of panels across pages."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from collections import namedtuple
+
+
+#: A page of panels: the page number (counting from 0), the frozen
+#: locator for the page, the range of global panel indices on the page,
+#: and the (row, column) of the panel for each of those indices.
+Page = namedtuple('Page', ['number', 'locator', 'indices', 'cells'])
+
+
+def paginate(locator, count, order='row', shrink_last=False):
+    """
+    Split a number of panels across pages, each laid out by a locator.
+
+    Pages are generated lazily, so any number of panels can be
+    paginated without building every page up front. Every full page
+    shares the same frozen locator, whose layout is only computed once.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator for a full page, defining the number of rows and
+        columns of panels per page and their sizes. A
+        `FigureSizeLocator` can be used to fix the page size.
+
+    * count: int
+        The total number of panels.
+
+    Keyword arguments:
+
+    * order (default='row'): str
+        The order panels are placed on each page, either "row" for
+        row-major order or "column" for column-major order.
+
+    * shrink_last (default=False): bool
+        If `False` a partial last page has the same size as a full page,
+        with its remaining panel slots left empty. If `True` the empty
+        rows (or columns for column-major order) are removed from the
+        last page, so the page is smaller. In both cases the panels on
+        the last page are the same size as on every other page.
+
+    Returns:
+
+    * pages: generator of Page
+        A named tuple with fields `number`, `locator`, `indices` and
+        `cells` for each page.
+
+    """
+    if order not in ('row', 'column'):
+        raise ValueError('the order keyword must be either "row" or "column"')
+    if count < 0:
+        raise ValueError('the number of panels cannot be negative')
+    return _pages(locator.frozen(), count, order, shrink_last)
+
+
+def page_count(locator, count):
+    """
+    Returns the number of pages needed for a number of panels.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator for a full page.
+
+    * count: int
+        The total number of panels.
+
+    """
+    per_page = locator.rows * locator.columns
+    return -(-count // per_page)
+
+
+def _pages(template, count, order, shrink_last):
+    """Generate the pages of a pagination."""
+    for number in range(page_count(template, count)):
+        yield _page(template, count, number, order, shrink_last)
+
+
+def _page(template, count, number, order, shrink_last):
+    """Construct a single page of a pagination."""
+    rows, columns = template.rows, template.columns
+    per_page = rows * columns
+    start = number * per_page
+    indices = range(start, min(start + per_page, count))
+    n = len(indices)
+    locator = template
+    if shrink_last and n < per_page:
+        if order == 'row':
+            rows = -(-n // columns)
+        else:
+            columns = -(-n // rows)
+        # The page has the template's panel sizes, separation and
+        # padding, and just enough rows or columns:
+        locator = template._subgrid(rows, columns)
+    if order == 'row':
+        cells = [divmod(k, columns) for k in range(n)]
+    else:
+        cells = [divmod(k, rows)[::-1] for k in range(n)]
+    return Page(number, locator, indices, cells)
@@ -0,0 +1,355 @@
+"""Rendering panels separately and compositing them into one image."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+
+from ._batch import _prepare_matplotlib
+
+
+def render_panels(locator, draw, dpi, block=(1, 1), max_workers=None,
+                  background=255, axes_kw=None, out=None):
+    """
+    Render panels separately, in parallel, and composite them into an
+    image of the whole figure.
+
+    The panels are split into rectangular blocks, and each block is
+    rendered on its own figure whose size in pixels is exactly that of
+    the block, then copied into the image at the block's integer pixel
+    offset given by `locator.panel_pixel_boxes`. No resampling is done,
+    so the panels are identical to those that would be rendered on a
+    figure of the whole grid with pixel-aligned geometry. Anything drawn
+    outside a block, such as tick labels in the padding or separations
+    between blocks, is not included in the image.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator defining the layout of the panels.
+
+    * draw: callable
+        A function called as `draw(ax, row, column)` to draw the panel
+        in the given row and column on the axes `ax`. When rendering in
+        worker processes it must be picklable, so should be a
+        module-level function or a `functools.partial` of one.
+
+    * dpi: float
+        The resolution of the image in dots (pixels) per inch.
+
+    Keyword arguments:
+
+    * block (default=(1, 1)): tuple of 2 ints
+        The number of rows and columns of panels rendered together in
+        one block. Blocks at the bottom and right of the grid may be
+        smaller.
+
+    * max_workers (default=None): int
+        The number of worker processes, defaults to the number of CPUs.
+        If 1, blocks are rendered one after another in this process.
+
+    * background (default=255): int or array_like
+        The value of pixels outside of all blocks, either a single
+        value or an RGBA value.
+
+    * axes_kw (default=None): dict
+        Keyword arguments passed to the constructor of each axes.
+
+    * out (default=None): numpy.ndarray
+        A uint8 array of shape (height, width, 4) to composite into,
+        which may be a `numpy.memmap`. Its pixels outside all blocks are
+        not modified.
+
+    Returns:
+
+    * image: numpy.ndarray
+        A uint8 RGBA array of shape (height, width, 4), where the width
+        and height are given by `locator.figsize_px(dpi)`.
+
+    """
+    width, height = locator.figsize_px(dpi)
+    if out is None:
+        out = np.empty((height, width, 4), dtype=np.uint8)
+        out[...] = background
+    elif out.shape != (height, width, 4):
+        raise ValueError('out must have shape {}, got {}'.format(
+            (height, width, 4), out.shape))
+    for left, top, pixels in _rendered_blocks(locator, draw, dpi, block,
+                                              max_workers, axes_kw):
+        _composite(out, left, top, pixels)
+    return out
+
+
+def render_panels_png(locator, draw, dpi, path, block=(1, 1),
+                      max_workers=None, background=255, axes_kw=None,
+                      tempdir=None, compression=6):
+    """
+    Render panels separately, in parallel, and write the composited
+    image straight to a PNG file.
+
+    This is `render_panels` for images too large to hold in memory. The
+    image is composited into a temporary file through `numpy.memmap`
+    views of just the rows each block covers, and the PNG file is
+    written from it a band of rows at a time, so memory use is bounded
+    by the size of the blocks being rendered rather than the size of
+    the image.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator defining the layout of the panels.
+
+    * draw: callable
+        A function called as `draw(ax, row, column)` to draw each panel,
+        as for `render_panels`.
+
+    * dpi: float
+        The resolution of the image in dots (pixels) per inch.
+
+    * path: str
+        The name of the PNG file to write.
+
+    Keyword arguments:
+
+    * block, max_workers, background, axes_kw:
+        As for `render_panels`.
+
+    * tempdir (default=None): str
+        The directory to create the temporary file in, defaults to the
+        system temporary directory. It must have space for an RGBA
+        image of the whole figure.
+
+    * compression (default=6): int
+        The zlib compression level of the PNG file, from 0 to 9.
+
+    """
+    width, height = locator.figsize_px(dpi)
+    band = _band_rows(width * 4)
+    with tempfile.NamedTemporaryFile(dir=tempdir, suffix='.rgba') as scratch:
+        scratch.truncate(width * height * 4)
+        for top in range(0, height, band):
+            rows = _map_rows(scratch, width, top, min(band, height - top))
+            rows[...] = background
+            del rows
+        for left, top, pixels in _rendered_blocks(locator, draw, dpi, block,
+                                                  max_workers, axes_kw):
+            rows = _map_rows(scratch, width, top, len(pixels))
+            _composite(rows, left, 0, pixels)
+            del rows
+        _write_png_bands(
+            path, width, height, 4, compression,
+            (_map_rows(scratch, width, top, min(band, height - top), 'r')
+             for top in range(0, height, band)))
+
+
+def write_png(path, image, compression=6):
+    """
+    Write an image to a PNG file a band of rows at a time.
+
+    Only the rows being compressed are read from the image at once, so
+    the image may be a `numpy.memmap` larger than the available memory.
+
+    Arguments:
+
+    * path: str
+        The name of the PNG file to write.
+
+    * image: numpy.ndarray
+        A uint8 array of shape (height, width, 3) for RGB or (height,
+        width, 4) for RGBA.
+
+    Keyword argument:
+
+    * compression (default=6): int
+        The zlib compression level, from 0 to 9.
+
+    """
+    if image.dtype != np.uint8 or image.ndim != 3 or \
+            image.shape[2] not in (3, 4):
+        raise ValueError('image must be a uint8 array of shape '
+                         '(height, width, 3) or (height, width, 4)')
+    height, width, channels = image.shape
+    band = _band_rows(width * channels)
+    _write_png_bands(path, width, height, channels, compression,
+                     (image[top:top + band] for top in range(0, height, band)))
+
+
+def _rendered_blocks(locator, draw, dpi, block, max_workers, axes_kw):
+    """
+    Generate the pixel offset and RGBA pixels of each rendered block of
+    panels.
+
+    """
+    state = (locator.frozen(), draw, dpi, axes_kw or {})
+    blocks = _blocks(locator.rows, locator.columns, block)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1:
+        for b in blocks:
+            yield _render_block(state, b)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_initialize_worker,
+                             initargs=state) as executor:
+        # Only a few blocks per worker are in flight at a time, so
+        # rendered blocks do not accumulate in memory waiting for their
+        # turn to be composited:
+        pending = deque()
+        for b in blocks:
+            if len(pending) == 2 * max_workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(_render_worker_block, b))
+        while pending:
+            yield pending.popleft().result()
+
+
+def _map_rows(f, width, top, rows, mode='r+'):
+    """Map rows of an RGBA image stored in a file."""
+    return np.memmap(f, dtype=np.uint8, mode=mode, offset=top * width * 4,
+                     shape=(rows, width, 4))
+
+
+def _write_png_bands(path, width, height, channels, compression, bands):
+    """Write a PNG file from an iterable of bands of image rows."""
+    rowbytes = width * channels
+    filtered = None
+    compressor = zlib.compressobj(compression)
+    with open(path, 'wb') as f:
+        f.write(_PNG_SIGNATURE)
+        _write_png_chunk(f, b'IHDR', struct.pack(
+            '>IIBBBBB', width, height, 8, 6 if channels == 4 else 2, 0, 0, 0))
+        for rows in bands:
+            rows = rows.reshape(-1, rowbytes)
+            n = len(rows)
+            if filtered is None or len(filtered) < n:
+                # Each row is stored with the "sub" filter, the difference
+                # from the pixel to its left, which compresses smooth plots
+                # well:
+                filtered = np.empty((n, rowbytes + 1), dtype=np.uint8)
+                filtered[:, 0] = 1
+            filtered[:n, 1:channels + 1] = rows[:, :channels]
+            np.subtract(rows[:, channels:], rows[:, :-channels],
+                        out=filtered[:n, channels + 1:])
+            del rows
+            data = compressor.compress(filtered[:n].tobytes())
+            if data:
+                _write_png_chunk(f, b'IDAT', data)
+        _write_png_chunk(f, b'IDAT', compressor.flush())
+        _write_png_chunk(f, b'IEND', b'')
+
+
+#: The first bytes of every PNG file.
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+#: The approximate number of bytes of an image processed at a time when
+#: filling or writing it in bands of rows.
+_BAND_BYTES = 1 << 22
+
+
+def _band_rows(rowbytes):
+    """The number of image rows in a band."""
+    return max(1, _BAND_BYTES // rowbytes)
+
+
+def _write_png_chunk(f, kind, data):
+    """Write a chunk of a PNG file."""
+    f.write(struct.pack('>I', len(data)))
+    f.write(kind)
+    f.write(data)
+    f.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind)) & 0xffffffff))
+
+
+def _blocks(rows, columns, block):
+    """The (row slice, column slice) of each block of panels."""
+    block_rows, block_columns = block
+    if block_rows < 1 or block_columns < 1:
+        raise ValueError('blocks must contain at least one panel')
+    return [(slice(r, min(r + block_rows, rows)),
+             slice(c, min(c + block_columns, columns)))
+            for r in range(0, rows, block_rows)
+            for c in range(0, columns, block_columns)]
+
+
+def _composite(out, left, top, pixels):
+    """Copy a rendered block into the image."""
+    height, width = pixels.shape[:2]
+    out[top:top + height, left:left + width] = pixels
+
+
+def _exact_inches(pixels, dpi):
+    """
+    The length in inches of a whole number of pixels, rounded up if
+    needed so the renderer does not truncate it to one pixel fewer.
+
+    """
+    inches = pixels / dpi
+    if inches * dpi < pixels:
+        inches = np.nextafter(inches, np.inf)
+    return inches
+
+
+def _render_block(state, block):
+    """
+    Render one block of panels, returning its pixel offset and its RGBA
+    pixels.
+
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    locator, draw, dpi, axes_kw = state
+    rows, columns = block
+    boxes = locator.panel_pixel_boxes(dpi)[rows, columns]
+    left, top = boxes[..., 0].min(), boxes[..., 1].min()
+    width = boxes[..., 2].max() - left
+    height = boxes[..., 3].max() - top
+    fig = Figure(figsize=(_exact_inches(width, dpi),
+                          _exact_inches(height, dpi)), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    for i, row in enumerate(range(rows.start, rows.stop)):
+        for j, column in enumerate(range(columns.start, columns.stop)):
+            l, t, r, b = boxes[i, j]
+            position = ((l - left) / width, (top + height - b) / height,
+                        (r - l) / width, (b - t) / height)
+            ax = fig.add_axes(position, **axes_kw)
+            draw(ax, row, column)
+    canvas.draw()
+    pixels = np.asarray(canvas.buffer_rgba())[:height, :width]
+    return left, top, pixels.copy()
+
+
+#: The state of a worker process: the locator, the draw function, the
+#: resolution and the axes keyword arguments.
+_worker = {}
+
+
+def _initialize_worker(*state):
+    """Prepare a worker process for rendering blocks."""
+    _prepare_matplotlib()
+    _worker['state'] = state
+
+
+def _render_worker_block(block):
+    """Render one block of panels in a worker process."""
+    return _render_block(_worker['state'], block)
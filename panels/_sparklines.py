@@ -0,0 +1,193 @@
+"""Lightweight panels drawn as collections in a single axes."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from collections import namedtuple
+
+from matplotlib.collections import LineCollection
+import numpy as np
+
+
+#: The artists making up a grid of lightweight panels: the single axes
+#: covering the figure, the collection holding the data of every panel,
+#: and the collection of panel frames (or `None`).
+Sparklines = namedtuple('Sparklines', ['axes', 'collection', 'frames'])
+
+
+def sparklines(locator, fig, data, kind='line', order='row', xlim=None,
+               ylim=None, margin=0.05, frames=False, frame_kw=None,
+               **kwargs):
+    """
+    Draw a small line or scatter plot in every panel of a locator using
+    a single axes, rather than one axes per panel.
+
+    The data of each panel is mapped into its panel by an affine
+    transform, and the data of all panels is drawn as a single
+    collection. This is much cheaper than creating an axes per panel
+    for grids of many small plots, but the panels have no axes
+    decorations of their own.
+
+    Arguments:
+
+    * locator: PanelSizeLocator or FigureSizeLocator
+        The locator defining the panel positions.
+
+    * fig: matplotlib.figure.Figure
+        The figure to draw in.
+
+    * data: iterable
+        An (x, y) pair of 1-dimensional arrays for each panel, in the
+        order given by `order`. There may be fewer data sets than
+        panels, in which case the remaining panels are left empty.
+        Missing (NaN) values are not drawn and leave a gap in a line.
+
+    Keyword arguments:
+
+    * kind (default='line'): str
+        The kind of plot, either 'line' to draw a `LineCollection` or
+        'scatter' to draw a `PathCollection` of markers.
+
+    * order (default='row'): str
+        The order panels are filled in, either "row" for row-major
+        order or "column" for column-major order.
+
+    * xlim, ylim (default=None): (float, float)
+        The data limits mapped to the extent of every panel. If not
+        given each panel is scaled to the range of its own data plus a
+        margin, as a matplotlib axes would autoscale. Data outside the
+        limits is clipped to the panel edges.
+
+    * margin (default=0.05): float
+        The padding added to each side of the autoscaled data limits,
+        as a fraction of the data range, like matplotlib's axes
+        margins. It is not used for limits given with `xlim` or `ylim`.
+
+    * frames (default=False): bool
+        If `True` a frame is drawn around every panel, as a single
+        `LineCollection`.
+
+    * frame_kw (default=None): dict
+        Keyword arguments for the frame `LineCollection`.
+
+    Any other keyword arguments are passed to the `LineCollection`
+    constructor, or to `scatter` when `kind='scatter'`.
+
+    Returns:
+
+    * sparklines: Sparklines
+        A named tuple with fields `axes`, `collection` and `frames`.
+
+    """
+    if kind not in ('line', 'scatter'):
+        raise ValueError('the kind keyword must be either "line" or "scatter"')
+    positions = locator.panel_positions(order=order, flatten=True)
+    xs, ys = [], []
+    for n, (x, y) in enumerate(data):
+        if n == len(positions):
+            raise ValueError('more data sets than panels')
+        xs.append(np.asarray(x, dtype=np.float64).ravel())
+        ys.append(np.asarray(y, dtype=np.float64).ravel())
+        if xs[-1].shape != ys[-1].shape:
+            raise ValueError('x and y must have the same length for each '
+                             'panel')
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    X, Y, lengths = _map_to_panels(xs, ys, positions, xlim, ylim, margin)
+    if kind == 'line':
+        points = np.column_stack([X, Y])
+        segments = np.split(points, np.cumsum(lengths)[:-1])
+        collection = LineCollection(segments, **kwargs)
+        ax.add_collection(collection, autolim=False)
+    else:
+        collection = ax.scatter(X, Y, **kwargs)
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+    frame_collection = None
+    if frames:
+        frame_collection = LineCollection(_frame_outlines(positions),
+                                          **(frame_kw or {}))
+        ax.add_collection(frame_collection, autolim=False)
+    return Sparklines(ax, collection, frame_collection)
+
+
+def _map_to_panels(xs, ys, positions, xlim, ylim, margin):
+    """
+    Map the data of each panel into figure coordinates within its panel,
+    returning the mapped x and y values of all panels concatenated, and
+    the number of values for each panel.
+
+    """
+    lengths = np.array([len(x) for x in xs], dtype=np.intp)
+    if not lengths.size:
+        return np.empty(0), np.empty(0), lengths
+    # The panel each value belongs to, used to gather per-panel transforms:
+    panel = np.repeat(np.arange(len(lengths)), lengths)
+    mapped = []
+    for values, limits, offset_index in ((xs, xlim, 0), (ys, ylim, 1)):
+        values = np.concatenate(values)
+        lower, upper = _panel_limits(values, lengths, limits, margin)
+        if limits is not None:
+            values = np.clip(values, lower, upper)
+        origin = positions[:len(lengths), offset_index]
+        extent = positions[:len(lengths), offset_index + 2]
+        scale = extent / (upper - lower)
+        offset = origin - lower * scale
+        mapped.append(values * scale[panel] + offset[panel])
+    return mapped[0], mapped[1], lengths
+
+
+def _panel_limits(values, lengths, limits, margin):
+    """
+    The lower and upper data limits of each panel, either the given
+    limits or the range of each panel's data expanded by the margin.
+    Missing (NaN) values are ignored, as they are by matplotlib, and a
+    panel whose values are all missing is treated like constant data.
+
+    """
+    if limits is not None:
+        lower = np.full(len(lengths), limits[0], dtype=np.float64)
+        upper = np.full(len(lengths), limits[1], dtype=np.float64)
+        return lower, upper
+    lower = np.zeros(len(lengths))
+    upper = np.zeros(len(lengths))
+    # Empty panels cannot be reduced, they have no values to map anyway:
+    nonempty = lengths > 0
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])[nonempty]
+    lower[nonempty] = np.fmin.reduceat(values, starts)
+    upper[nonempty] = np.fmax.reduceat(values, starts)
+    # Panels with only missing values reduce to NaN, they have nothing to
+    # draw either:
+    missing = np.isnan(lower)
+    lower[missing] = upper[missing] = 0
+    span = upper - lower
+    # Constant data is placed in the middle of the panel:
+    flat = span == 0
+    span[flat] = 1
+    lower[flat] -= 0.5
+    return lower - margin * span, lower + (1 + margin) * span
+
+
+def _frame_outlines(positions):
+    """Closed rectangular outlines of panels in figure coordinates."""
+    x, y, w, h = (positions[:, i] for i in range(4))
+    xs = np.stack([x, x + w, x + w, x, x], axis=-1)
+    ys = np.stack([y, y, y + h, y + h, y], axis=-1)
+    return np.stack([xs, ys], axis=-1)
@@ -18,42 +18,132 @@
 
 from __future__ import (absolute_import, division, print_function)
 
+from enum import Enum
 
-def convert_units(quantity, source_units, target_units):
+import numpy as np
+
+
+class Unit(str, Enum):
+    """
+    Canonical units of length. Members can be used anywhere a unit
+    string is accepted, and are used as-is without any parsing.
+
+    """
+    MM = 'mm'
+    CM = 'cm'
+    INCHES = 'inches'
+
+
+def convert_units(quantity, source_units, target_units, out=None):
     """
     Convert a quantity from one unit of length to another. Supported
-    units of length are 'mm', 'cm', and 'inches'.
+    units of length are 'mm', 'cm', and 'inches', or equivalently the
+    members of `Unit`.
 
     Arguments:
 
-    * quantity: numeric
-        The quantity to convert.
+    * quantity: numeric or array_like
+        The quantity to convert. This may be a scalar, a sequence of
+        numbers, or a numpy array.
 
-    * source_units: string
+    * source_units: string or Unit
         The units of `quantity`.
 
-    * target_units: string
+    * target_units: string or Unit
         The desired units of the output.
 
+    Keyword argument:
+
+    * out (optional): numpy.ndarray
+        An array to store the converted values in, it must have a shape
+        that `quantity` broadcasts to. This may be `quantity` itself to
+        convert an array in place.
+
     Returns:
 
-    * qn: numeric
+    * qn: numeric or numpy.ndarray
         The quantity converted to the units given by `target_units`.
+        Scalar input gives scalar output, any other input (or the use
+        of `out`) gives a numpy array.
 
     """
+    scaling = _resolve_scaling(source_units, target_units)
+    return _apply_scaling(quantity, scaling, out)
+
+
+def conversion_factor(source_units, target_units):
+    """
+    Returns the factor that converts a length from one unit to another
+    by multiplication. Supported units of length are 'mm', 'cm', and
+    'inches'.
+
+    Arguments:
+
+    * source_units: string or Unit
+        The units to convert from.
+
+    * target_units: string or Unit
+        The units to convert to.
+
+    Returns:
+
+    * factor: float
+        The length of one `source_units` measured in `target_units`.
+
+    """
+    multiply, constant = _resolve_scaling(source_units, target_units)
+    return constant if multiply else 1. / constant
+
+
+def unit_converter(source_units, target_units):
+    """
+    Returns a function that converts quantities from one unit of length
+    to another. The units are resolved once when the converter is
+    created, making it suitable for use in loops.
+
+    Arguments:
+
+    * source_units: string or Unit
+        The units of the quantities to convert.
+
+    * target_units: string or Unit
+        The desired units of the output.
+
+    Returns:
+
+    * converter: callable
+        A function `converter(quantity, out=None)` that behaves like
+        `convert_units(quantity, source_units, target_units, out=out)`.
+
+    """
+    scaling = _resolve_scaling(source_units, target_units)
+
+    def converter(quantity, out=None):
+        return _apply_scaling(quantity, scaling, out)
+
+    return converter
+
+
+def _resolve_scaling(source_units, target_units):
+    """Look up the scaling converting between two units of length."""
     source_units = _normalize_units(source_units)
     target_units = _normalize_units(target_units)
     if source_units == target_units:
-        return quantity
-    try:
-        converters_from_source_units = _CONVERSIONS[source_units]
-    except KeyError:
-        raise
-    try:
-        converter = converters_from_source_units[target_units]
-    except KeyError:
-        raise
-    return converter(quantity)
+        return _IDENTITY
+    return _SCALINGS[source_units, target_units]
+
+
+def _apply_scaling(quantity, scaling, out):
+    """Scale a scalar or array quantity by a conversion scaling."""
+    multiply, constant = scaling
+    if out is None and np.isscalar(quantity):
+        if scaling is _IDENTITY:
+            # Scalars are returned unchanged, preserving their type:
+            return quantity
+        return quantity * constant if multiply else quantity / constant
+    # Apply a single scale factor to the whole array at once:
+    ufunc = np.multiply if multiply else np.true_divide
+    return ufunc(quantity, constant, out=out)
 
 
 def _normalize_units(units):
@@ -67,7 +157,14 @@ def _normalize_units(units):
         centim[.]* -> cm
         inch[.]*   -> inches
 
+    Recognised units are returned as the corresponding `Unit`, and the
+    result is interned so repeated spellings skip the parsing.
+
     """
+    try:
+        return _UNIT_CACHE[units]
+    except KeyError:
+        pass
     normed = units.lower()
     if normed.startswith('inch'):
         normed = 'inches'
@@ -75,15 +172,42 @@ def _normalize_units(units):
         normed = 'mm'
     elif normed.startswith('centim'):
         normed = 'cm'
+    try:
+        normed = Unit(normed)
+    except ValueError:
+        # Unrecognised units are not interned, they will fail when used
+        # in a conversion:
+        return normed
+    if len(_UNIT_CACHE) < _UNIT_CACHE_SIZE:
+        _UNIT_CACHE[units] = normed
     return normed
 
 
-#: Conversion functions to go between the three units of length.
-_CONVERSIONS = {
-    'mm': {'cm': lambda mm: mm / 10,
-           'inches': lambda mm: mm / 25.4},
-    'cm': {'mm': lambda cm: cm * 10,
-           'inches': lambda cm: (cm * 10) / 25.4},
-    'inches': {'mm': lambda inches: inches * 25.4,
-               'cm': lambda inches: inches * 25.4 / 10},
-}
+#: The maximum number of unit spellings to intern.
+_UNIT_CACHE_SIZE = 256
+
+#: Interned unit spellings mapped to their canonical `Unit`.
+_UNIT_CACHE = dict((unit, unit) for unit in Unit)
+
+
+#: The length of each unit in millimetres.
+_MM_PER_UNIT = {Unit.MM: 1., Unit.CM: 10., Unit.INCHES: 25.4}
+
+#: The scaling converting between each pair of different units of length,
+#: as a flag that is true if the conversion multiplies by a constant rather
+#: than dividing by it, and the constant. The constant is never less than
+#: one, so a conversion such as mm to inches divides by exactly 25.4 rather
+#: than multiplying by its inexact reciprocal.
+_SCALINGS = {}
+for _source in _MM_PER_UNIT:
+    for _target in _MM_PER_UNIT:
+        if _MM_PER_UNIT[_source] > _MM_PER_UNIT[_target]:
+            _SCALINGS[_source, _target] = (
+                True, _MM_PER_UNIT[_source] / _MM_PER_UNIT[_target])
+        elif _MM_PER_UNIT[_source] < _MM_PER_UNIT[_target]:
+            _SCALINGS[_source, _target] = (
+                False, _MM_PER_UNIT[_target] / _MM_PER_UNIT[_source])
+del _source, _target
+
+#: The scaling for converting between identical units.
+_IDENTITY = (True, 1.)
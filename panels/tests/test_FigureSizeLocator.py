@@ -21,7 +21,8 @@ from __future__ import (absolute_import, division, print_function)
 from hypothesis import given, assume
 import pytest
 
-from panels import FigureSizeLocator
+from panels import (FigureSizeLocator, clear_locator_caches,
+                    locator_cache_info)
 from panels.tests import (almost_equal, gridsize_st, length_st, offset_st)
 
 
@@ -547,3 +548,75 @@ def test_height_spec_ill_conditioned(rows, columns, figheight, vsep, padtop,
         l = FigureSizeLocator(rows, columns, figheight=figheight, vsep=vsep,
                               padtop=padtop, padbottom=padbottom, units=units)
     assert 'not tall enough' in str(excinfo.value)
+
+
+#-----------------------------------------------------------------------
+# Test memoization of panel sizes.
+#-----------------------------------------------------------------------
+
+def test_panel_size_memoized():
+    clear_locator_caches()
+    first = FigureSizeLocator.panel_size(2, 3, figwidth=100, hsep=5)
+    second = FigureSizeLocator.panel_size(2, 3, figwidth=100, hsep=5)
+    assert first == second
+    info = locator_cache_info()['panel_size']
+    assert info.misses == 1
+    assert info.hits == 1
+    clear_locator_caches()
+    info = locator_cache_info()['panel_size']
+    assert info.hits == info.misses == info.currsize == 0
+
+
+def test_panel_size_memoized_warns_every_time():
+    clear_locator_caches()
+    for _ in range(2):
+        with pytest.warns(UserWarning):
+            FigureSizeLocator.panel_size(1, 1, figwidth=10, figheight=10,
+                                         panelratio=1)
+    assert locator_cache_info()['panel_size'].hits == 1
+
+
+def test_panel_size_memoized_errors_not_cached():
+    clear_locator_caches()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            FigureSizeLocator.panel_size(1, 3, figwidth=10, hsep=10)
+    assert locator_cache_info()['panel_size'].currsize == 0
+
+
+#-----------------------------------------------------------------------
+# Tests snapping geometry to device units.
+#-----------------------------------------------------------------------
+
+@pytest.mark.parametrize('dpi', [72, 150, 300])
+@given(rows=gridsize_st, columns=gridsize_st, hsep=offset_st, vsep=offset_st,
+       padleft=offset_st, padtop=offset_st)
+def test_snap_keeps_figure_size(dpi, rows, columns, hsep, vsep, padleft,
+                                padtop):
+    l = FigureSizeLocator(rows, columns, figwidth=500.3, figheight=400.7,
+                          hsep=hsep % 2, vsep=vsep % 2, padleft=padleft % 2,
+                          padtop=padtop % 2, snap=dpi)
+    assert l.figsize_px(dpi) == (round(500.3 / 25.4 * dpi),
+                                 round(400.7 / 25.4 * dpi))
+    boxes = l.panel_pixel_boxes(dpi)
+    width, height = l.figsize_px(dpi)
+    assert len(set((boxes[..., 2] - boxes[..., 0]).ravel())) == 1
+    assert len(set((boxes[..., 3] - boxes[..., 1]).ravel())) == 1
+    assert (boxes[..., 2] <= width).all() and (boxes[..., 3] <= height).all()
+    for (x, y, w, h) in l.panel_position_iterator():
+        assert almost_equal(x * width, round(x * width), rtol=0, atol=1e-6)
+        assert almost_equal(y * height, round(y * height), rtol=0, atol=1e-6)
+
+
+def test_snap_with_panelratio():
+    l = FigureSizeLocator(2, 3, figwidth=3.01, panelratio=2, hsep=0.25,
+                          units='inches', snap=100)
+    assert l.figsize_px(100) == (301, 84)
+    assert l.panel_pixel_boxes(100)[0].tolist() == [
+        [0, 0, 83, 42], [108, 0, 191, 42], [216, 0, 299, 42]]
+
+
+def test_snap_too_small():
+    with pytest.raises(ValueError):
+        FigureSizeLocator(1, 4, figwidth=1, hsep=0.3, units='inches',
+                          snap=2)
@@ -0,0 +1,148 @@
+"""Tests for `panels.FrozenPanelSizeLocator` and `FrozenFigureSizeLocator`."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import pickle
+
+from hypothesis import given
+import pytest
+
+from panels import (PanelSizeLocator, FigureSizeLocator,
+                    FrozenPanelSizeLocator, FrozenFigureSizeLocator,
+                    clear_locator_caches, locator_cache_info)
+from panels.tests import gridsize_st, length_st, offset_st, unit_st
+
+
+@given(rows=gridsize_st, columns=gridsize_st, panelwidth=length_st,
+       panelheight=length_st, hsep=offset_st, vsep=offset_st,
+       padleft=offset_st, padtop=offset_st, units=unit_st)
+def test_same_geometry_as_mutable(rows, columns, panelwidth, panelheight,
+                                  hsep, vsep, padleft, padtop, units):
+    """Frozen locators have the same geometry as mutable locators."""
+    kwargs = dict(hsep=hsep, vsep=vsep, padleft=padleft, padtop=padtop,
+                  units=units)
+    l = PanelSizeLocator(rows, columns, panelwidth, panelheight, **kwargs)
+    f = FrozenPanelSizeLocator(rows, columns, panelwidth, panelheight,
+                               **kwargs)
+    assert f.figsize == l.figsize
+    assert f.figwidth == l.figwidth
+    assert list(f.panel_position_iterator()) == \
+        list(l.panel_position_iterator())
+    assert (f.panel_positions() == l.panel_positions()).all()
+
+
+@given(rows=gridsize_st, columns=gridsize_st, figwidth=length_st,
+       units=unit_st)
+def test_figure_size_same_geometry_as_mutable(rows, columns, figwidth, units):
+    l = FigureSizeLocator(rows, columns, figwidth=figwidth, units=units)
+    f = FrozenFigureSizeLocator(rows, columns, figwidth=figwidth, units=units)
+    assert f.figsize == l.figsize
+    assert f.panel_position(rows - 1, 0) == l.panel_position(rows - 1, 0)
+
+
+def test_equality_and_hash():
+    a = FrozenPanelSizeLocator(2, 3, 10, 20, hsep=1, units='mm')
+    b = FrozenPanelSizeLocator(2, 3, 10, 20, hsep=1, units='millimetres')
+    c = FrozenPanelSizeLocator(2, 3, 10, 20, hsep=2)
+    assert a == b
+    assert hash(a) == hash(b)
+    assert a != c
+    assert len({a, b, c}) == 2
+
+
+def test_frozen_types_are_distinct():
+    a = FrozenPanelSizeLocator(1, 1, 10, 10)
+    b = FrozenFigureSizeLocator(1, 1, figwidth=10, figheight=10)
+    assert a != b
+
+
+def test_immutable():
+    f = FrozenPanelSizeLocator(2, 3, 10, 20)
+    with pytest.raises(AttributeError):
+        f.hsep = 5
+    with pytest.raises(AttributeError):
+        del f.rows
+    with pytest.raises(AttributeError):
+        f.extra = 1
+    assert not hasattr(f, '__dict__')
+
+
+@pytest.mark.parametrize('locator', [
+    FrozenPanelSizeLocator(2, 3, 10, 20, hsep=1, padtop=4),
+    FrozenFigureSizeLocator(2, 3, figwidth=100, panelratio=2, vsep=3),
+])
+def test_pickle_and_copy(locator):
+    locator.panel_positions()
+    restored = pickle.loads(pickle.dumps(locator))
+    assert type(restored) is type(locator)
+    assert restored == locator
+    assert restored.figsize == locator.figsize
+    assert copy.copy(locator) is locator
+    assert copy.deepcopy(locator) is locator
+
+
+@pytest.mark.parametrize('locator', [
+    PanelSizeLocator(2, 3, 10, 20, hsep=1, padtop=4),
+    FigureSizeLocator(2, 3, figwidth=100, panelratio=2, vsep=3),
+])
+def test_frozen_from_mutable(locator):
+    f = locator.frozen()
+    assert f.figsize == locator.figsize
+    assert f.panel_position(1, 2) == locator.panel_position(1, 2)
+    assert isinstance(f, FrozenFigureSizeLocator) == \
+        isinstance(locator, FigureSizeLocator)
+    assert f.frozen() is f
+
+
+def test_cached_construction():
+    clear_locator_caches()
+    a = FrozenFigureSizeLocator.cached(2, 3, figwidth=100, hsep=5)
+    b = FrozenFigureSizeLocator.cached(2, 3, hsep=5, figwidth=100)
+    c = FrozenPanelSizeLocator.cached(2, 3, 10, 10)
+    assert a is b
+    assert a == FrozenFigureSizeLocator(2, 3, figwidth=100, hsep=5)
+    assert type(c) is FrozenPanelSizeLocator
+    info = locator_cache_info()['locator']
+    assert info.hits == 1
+    assert info.misses == 2
+
+
+def test_cached_construction_threaded():
+    clear_locator_caches()
+    def construct(n):
+        return FrozenFigureSizeLocator.cached(2, 3, figwidth=100 + n % 4)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        locators = list(executor.map(construct, range(400)))
+    assert len(set(locators)) == 4
+    info = locator_cache_info()['locator']
+    assert info.hits + info.misses == 400
+    assert info.currsize == 4
+
+
+def test_quantum_equality():
+    """Fixed-point locators compare by their integer geometry."""
+    a = FrozenPanelSizeLocator(2, 3, 10.0001, 20, hsep=1, quantum=0.001)
+    b = FrozenPanelSizeLocator(2, 3, 10.0002, 20, hsep=1, quantum=0.001)
+    c = FrozenPanelSizeLocator(2, 3, 10.0001, 20, hsep=1)
+    assert a == b
+    assert hash(a) == hash(b)
+    assert a != c
+    assert pickle.loads(pickle.dumps(a)) == a
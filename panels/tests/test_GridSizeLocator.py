@@ -0,0 +1,246 @@
+"""Tests for the `GridSizeLocator` and `GridFigureSizeLocator` classes."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import copy
+import pickle
+
+from hypothesis import given
+from hypothesis.strategies import floats, lists
+from matplotlib.figure import Figure
+import numpy as np
+import pytest
+
+from panels import (FrozenGridFigureSizeLocator, FrozenGridSizeLocator,
+                    GridFigureSizeLocator, GridSizeLocator, PanelSizeLocator,
+                    paginate)
+from panels.tests import (almost_equal, check_panels_in_figure, gridsize_st,
+                          length_st, offset_st)
+
+
+#: Length units to generate test cases for.
+TEST_UNITS = ['mm', 'cm', 'inches']
+
+#: A strategy to generate panel sizes for a few rows or columns.
+sizes_st = lists(length_st, min_size=1, max_size=10)
+
+
+#-----------------------------------------------------------------------
+# Tests for GridSizeLocator.
+#-----------------------------------------------------------------------
+
+@given(rows=gridsize_st, columns=gridsize_st, panelwidth=length_st,
+       panelheight=length_st, hsep=offset_st, vsep=offset_st,
+       padleft=offset_st, padtop=offset_st)
+def test_uniform_grid_matches_panel_size(rows, columns, panelwidth,
+                                         panelheight, hsep, vsep, padleft,
+                                         padtop):
+    g = GridSizeLocator([panelwidth] * columns, [panelheight] * rows,
+                        hsep=hsep, vsep=vsep, padleft=padleft, padtop=padtop)
+    l = PanelSizeLocator(rows, columns, panelwidth, panelheight, hsep=hsep,
+                         vsep=vsep, padleft=padleft, padtop=padtop)
+    assert np.allclose(g.figsize, l.figsize, rtol=1e-12)
+    assert np.allclose(g.panel_positions(), l.panel_positions(), rtol=1e-9,
+                       atol=1e-12)
+
+
+@given(columnwidths=sizes_st, rowheights=sizes_st)
+@pytest.mark.parametrize('units', TEST_UNITS)
+def test_sizes(units, columnwidths, rowheights):
+    g = GridSizeLocator(columnwidths, rowheights, hsep=1, vsep=2, padleft=3,
+                        padright=4, padtop=5, padbottom=6, units=units)
+    assert (g.rows, g.columns) == (len(rowheights), len(columnwidths))
+    assert almost_equal(g.figwidth, sum(columnwidths) +
+                        (len(columnwidths) - 1) + 7)
+    assert almost_equal(g.figheight, sum(rowheights) +
+                        2 * (len(rowheights) - 1) + 11)
+    positions = g.panel_positions()
+    assert np.allclose(positions[0, :, 2] * g.figwidth, columnwidths)
+    assert np.allclose(positions[:, 0, 3] * g.figheight, rowheights)
+    check_panels_in_figure(g)
+
+
+def test_per_gap_separation():
+    g = GridSizeLocator([10, 20, 30], [5, 15], hsep=[1, 2], vsep=[3],
+                        padleft=4, padtop=2)
+    assert g.figsize_in('mm') == (67, 25)
+    assert g.panel_position(0, 0) == (4 / 67, 18 / 25, 10 / 67, 5 / 25)
+    assert g.panel_position(1, 2) == (37 / 67, 0, 30 / 67, 15 / 25)
+    assert g.panel_position(0, 1) == (15 / 67, 18 / 25, 20 / 67, 5 / 25)
+
+
+@given(columnwidths=sizes_st, rowheights=sizes_st)
+def test_positions_match_position(columnwidths, rowheights):
+    g = GridSizeLocator(columnwidths, rowheights, hsep=0.5, vsep=0.25)
+    positions = g.panel_positions()
+    for row in range(g.rows):
+        for column in range(g.columns):
+            assert tuple(positions[row, column]) == \
+                g.panel_position(row, column)
+
+
+def test_wrong_number_of_gaps():
+    with pytest.raises(ValueError):
+        GridSizeLocator([1, 2, 3], [1], hsep=[1])
+    with pytest.raises(ValueError):
+        GridSizeLocator([1, 2, 3], [1, 2], vsep=[1, 2])
+    with pytest.raises(ValueError):
+        GridSizeLocator([], [1])
+
+
+def test_mutation_invalidates_layout():
+    g = GridSizeLocator([10, 20], [5])
+    assert g.figsize_in('mm') == (30, 5)
+    g.columnwidths = (10, 20, 30)
+    assert g.figsize_in('mm') == (60, 5)
+    g.hsep = (1, 2)
+    assert g.figsize_in('mm') == (63, 5)
+
+
+@given(columnwidths=lists(floats(1, 1e3), min_size=1, max_size=10),
+       rowheights=lists(floats(1, 1e3), min_size=1, max_size=10))
+def test_quantum(columnwidths, rowheights):
+    g = GridSizeLocator(columnwidths, rowheights, hsep=0.3, vsep=0.7,
+                        quantum=0.001)
+    columnwidths, rowheights = g._lengths()[:2]
+    width = sum(columnwidths) + 300 * (len(columnwidths) - 1)
+    for (x, y, w, h) in g.panel_position_iterator():
+        assert almost_equal(x * width, round(x * width), rtol=0, atol=1e-6)
+        assert almost_equal(w * width, round(w * width), rtol=0, atol=1e-6)
+
+
+def test_quantum_invalid():
+    with pytest.raises(ValueError):
+        GridSizeLocator([10, 10], [10], quantum=0)
+    with pytest.raises(ValueError):
+        FrozenGridSizeLocator([10, 10], [10], quantum=-0.1)
+    with pytest.raises(ValueError):
+        GridSizeLocator([10, 0.0004], [10], quantum=0.001)
+
+
+def test_label_outer_per_gap():
+    g = GridSizeLocator([10, 10, 10], [10], hsep=[0, 5])
+    axes = g.create_axes(Figure(), label_outer=True)
+    assert not axes[0, 1].spines['left'].get_visible()
+    assert axes[0, 2].spines['left'].get_visible()
+
+
+def test_paginate_shrink_last():
+    g = GridSizeLocator([10, 20], [5, 6, 7], hsep=[1], vsep=[2, 3])
+    last = list(paginate(g, 9, shrink_last=True))[-1]
+    assert last.locator == FrozenGridSizeLocator([10, 20], [5, 6], hsep=[1],
+                                                 vsep=[2])
+
+
+#-----------------------------------------------------------------------
+# Tests for GridFigureSizeLocator.
+#-----------------------------------------------------------------------
+
+@given(widthratios=sizes_st, heightratios=sizes_st)
+@pytest.mark.parametrize('units', TEST_UNITS)
+def test_figure_size(units, widthratios, heightratios):
+    g = GridFigureSizeLocator(widthratios, heightratios, figwidth=300,
+                              figheight=200, hsep=1, vsep=1, padleft=2,
+                              padbottom=3, units=units)
+    assert almost_equal(g.figwidth, 300)
+    assert almost_equal(g.figheight, 200)
+    widths = g.panel_positions()[0, :, 2]
+    assert np.allclose(widths / widths[0],
+                       np.array(widthratios) / widthratios[0])
+    check_panels_in_figure(g)
+
+
+def test_figure_size_panelratio():
+    g = GridFigureSizeLocator([1, 2], [1, 3], figwidth=34, panelratio=2,
+                              hsep=[4])
+    assert g.columnwidths == (10, 20)
+    assert g.rowheights == (5, 15)
+    g = GridFigureSizeLocator([1, 2], [1, 3], figheight=24, panelratio=2,
+                              vsep=[4])
+    assert g.columnwidths == (10, 20)
+    assert g.rowheights == (5, 15)
+
+
+def test_figure_size_errors():
+    with pytest.raises(ValueError):
+        GridFigureSizeLocator([1, 2], [1])
+    with pytest.raises(ValueError):
+        GridFigureSizeLocator([1, 2], [1], figwidth=10, hsep=10)
+    with pytest.raises(ValueError):
+        GridFigureSizeLocator([1, 2], [1, 1], figheight=10, vsep=[10])
+    with pytest.warns(UserWarning):
+        GridFigureSizeLocator([1, 2], [1], figwidth=10, figheight=10,
+                              panelratio=2)
+
+
+@pytest.mark.parametrize('dpi', [72, 300])
+def test_figure_size_snap(dpi):
+    g = GridFigureSizeLocator([1, 2, 1], [2, 1], figwidth=100.3,
+                              figheight=60.1, hsep=[2, 8], vsep=4,
+                              padleft=3.3, snap=dpi)
+    assert g.figsize_px(dpi) == (round(100.3 / 25.4 * dpi),
+                                 round(60.1 / 25.4 * dpi))
+    boxes = g.panel_pixel_boxes(dpi)
+    widths = boxes[0, :, 2] - boxes[0, :, 0]
+    assert abs(widths[1] - 2 * widths[0]) <= 1 and widths[0] == widths[2]
+    width, height = g.figsize_px(dpi)
+    for (x, y, w, h) in g.panel_position_iterator():
+        assert almost_equal(x * width, round(x * width), rtol=0, atol=1e-6)
+        assert almost_equal(y * height, round(y * height), rtol=0, atol=1e-6)
+
+
+#-----------------------------------------------------------------------
+# Tests for the frozen grid locators.
+#-----------------------------------------------------------------------
+
+def test_frozen():
+    g = GridSizeLocator([10, 20], [5, 6], hsep=[1], vsep=2)
+    f = g.frozen()
+    assert isinstance(f, FrozenGridSizeLocator)
+    assert f == FrozenGridSizeLocator((10, 20), (5, 6), hsep=(1,), vsep=2)
+    assert hash(f) == hash(FrozenGridSizeLocator([10, 20], [5, 6], hsep=[1],
+                                                 vsep=2))
+    assert f.panel_position(1, 1) == g.panel_position(1, 1)
+    assert f.frozen() is f
+    assert pickle.loads(pickle.dumps(f)) == f
+    assert copy.deepcopy(f) is f
+    with pytest.raises(AttributeError):
+        f.columnwidths = (1, 2)
+    assert 'columnwidths=(10, 20)' in repr(f)
+
+
+def test_frozen_figure_size():
+    g = GridFigureSizeLocator([1, 2], [1], figwidth=40, hsep=[1])
+    f = g.frozen()
+    assert isinstance(f, FrozenGridFigureSizeLocator)
+    assert f == FrozenGridFigureSizeLocator([1, 2], [1], figwidth=40,
+                                            hsep=[1])
+    assert f != FrozenGridSizeLocator(g.columnwidths, g.rowheights,
+                                      hsep=[1])
+    assert f.figsize == g.figsize
+
+
+def test_span_position():
+    g = GridSizeLocator([10, 20, 30], [5, 15], hsep=[1, 2], vsep=[3],
+                        padleft=4, padtop=2)
+    assert g.span_position(slice(0, 2), slice(1, 3)) == pytest.approx(
+        (15 / 67, 0, 52 / 67, 23 / 25))
+    positions = g.mosaic_positions('ABB\nACC')
+    assert positions['A'] == pytest.approx((4 / 67, 0, 10 / 67, 23 / 25))
+    assert positions['C'] == pytest.approx(g.span_position(1, slice(1, 3)))
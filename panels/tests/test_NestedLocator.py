@@ -0,0 +1,92 @@
+"""Tests for the `NestedLocator` class."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from matplotlib.figure import Figure
+import numpy as np
+import pytest
+
+from panels import (FigureSizeLocator, GridSizeLocator, NestedLocator,
+                    PanelSizeLocator)
+
+
+@pytest.fixture
+def outer():
+    return FigureSizeLocator(2, 4, figwidth=180, hsep=5, vsep=5)
+
+
+@pytest.fixture
+def inner():
+    return PanelSizeLocator(2, 2, 10, 10, hsep=2, vsep=2)
+
+
+def test_without_children(outer):
+    nested = NestedLocator(outer, {})
+    assert len(nested) == 8
+    assert nested.indices == tuple((r, c) for r in range(2) for c in range(4))
+    assert np.array_equal(nested.panel_positions(),
+                          outer.panel_positions(flatten=True))
+    assert nested.figsize == outer.figsize
+
+
+def test_nested_positions(outer, inner):
+    nested = NestedLocator(outer, {(0, 3): inner})
+    assert len(nested) == 11
+    assert nested.indices[:4] == ((0, 0), (0, 1), (0, 2), (0, 3, 0, 0))
+    assert nested.indices[6:8] == ((0, 3, 1, 1), (1, 0))
+    x, y, w, h = outer.panel_position(0, 3)
+    assert nested.panel_position(0, 3, 0, 0) == pytest.approx(
+        (x, y + h * 12 / 22, w * 10 / 22, h * 10 / 22))
+    assert nested.panel_position(0, 3, 1, 1) == pytest.approx(
+        (x + w * 12 / 22, y, w * 10 / 22, h * 10 / 22))
+    assert nested.panel_position(1, 3) == outer.panel_position(1, 3)
+    with pytest.raises(KeyError):
+        nested.panel_position(0, 3)
+    for index, position in zip(nested.indices, nested.panel_positions()):
+        assert nested.panel_position(*index) == tuple(position)
+
+
+def test_deeply_nested(outer, inner):
+    grid = GridSizeLocator([10, 30], [20], hsep=[5])
+    middle = NestedLocator(inner, {(1, 0): grid})
+    nested = NestedLocator(outer, {(1, 1): middle, (0, 0): inner})
+    assert len(nested) == 8 - 2 + 4 + 5
+    x, y, w, h = middle.panel_position(1, 0, 0, 1)
+    X, Y, W, H = outer.panel_position(1, 1)
+    assert nested.panel_position(1, 1, 1, 0, 0, 1) == pytest.approx(
+        (X + x * W, Y + y * H, w * W, h * H))
+
+
+def test_positions_read_only(outer, inner):
+    nested = NestedLocator(outer, {(0, 3): inner})
+    with pytest.raises(ValueError):
+        nested.panel_positions()[0, 0] = 1
+
+
+def test_child_outside(outer, inner):
+    with pytest.raises(ValueError):
+        NestedLocator(outer, {(2, 0): inner})
+
+
+def test_create_axes(outer, inner):
+    nested = NestedLocator(outer, {(0, 3): inner})
+    axes = nested.create_axes(Figure(figsize=nested.figsize))
+    assert list(axes) == list(nested.indices)
+    assert axes[0, 3, 1, 0].get_position().bounds == pytest.approx(
+        nested.panel_position(0, 3, 1, 0))
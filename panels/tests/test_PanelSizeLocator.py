@@ -18,10 +18,13 @@
 
 from __future__ import (absolute_import, division, print_function)
 
-from hypothesis import given
+from hypothesis import assume, example, given
+import numpy as np
 import pytest
 
-from panels import PanelSizeLocator
+from panels import (FigureSizeLocator, FrozenPanelSizeLocator,
+                    PanelSizeLocator, Unit, clear_locator_caches,
+                    locator_cache_info)
 from panels.tests import (check_panels_in_figure, gridsize_st, length_st,
                           offset_st, almost_equal)
 
@@ -223,3 +226,305 @@ def test_iterate_column_major(rows, columns):
     for n, pp in enumerate(l.panel_position_iterator(order='column')):
         assert almost_equal((n // rows) * dx, pp[0])
         assert almost_equal(1 - (n % rows + 1) * dy, pp[1])
+
+
+#-----------------------------------------------------------------------
+# Tests for the array of panel positions.
+#-----------------------------------------------------------------------
+
+@given(rows=gridsize_st, columns=gridsize_st, panelwidth=length_st,
+       panelheight=length_st, hsep=offset_st, vsep=offset_st,
+       padleft=offset_st, padtop=offset_st)
+def test_positions_match_position(rows, columns, panelwidth, panelheight,
+                                  hsep, vsep, padleft, padtop):
+    l = PanelSizeLocator(rows, columns, panelwidth, panelheight,
+                         hsep=hsep, vsep=vsep, padleft=padleft, padtop=padtop)
+    positions = l.panel_positions()
+    assert positions.shape == (rows, columns, 4)
+    for row in range(rows):
+        for column in range(columns):
+            assert tuple(positions[row, column]) == \
+                l.panel_position(row, column)
+
+
+@pytest.mark.parametrize("order", ['row', 'column'])
+@given(rows=gridsize_st, columns=gridsize_st)
+def test_positions_flattened_order(rows, columns, order):
+    l = PanelSizeLocator(rows, columns, 1, 1, hsep=0.5, vsep=0.25)
+    positions = l.panel_positions(order=order, flatten=True)
+    assert positions.shape == (rows * columns, 4)
+    for pos, pp in zip(positions, l.panel_position_iterator(order=order)):
+        assert tuple(pos) == pp
+
+
+def test_positions_invalid_order():
+    l = PanelSizeLocator(2, 2, 1, 1)
+    with pytest.raises(ValueError):
+        l.panel_positions(order='diagonal', flatten=True)
+
+
+#-----------------------------------------------------------------------
+# Tests for the cached layout.
+#-----------------------------------------------------------------------
+
+def test_positions_are_cached():
+    l = PanelSizeLocator(3, 4, 10, 5, hsep=2, vsep=1)
+    assert l.panel_positions() is l.panel_positions()
+    assert not l.panel_positions().flags.writeable
+
+
+def test_sizes_do_not_compute_positions():
+    l = PanelSizeLocator(300, 300, 10, 5, hsep=2, vsep=1)
+    assert l.figsize_in('mm') == (10 * 300 + 2 * 299, 5 * 300 + 299)
+    assert l.panelwidth_fig == 10 / 3598
+    assert l._panels_cache is None
+    assert l.panel_positions()[0, 0, 2] == l.panelwidth_fig
+    assert l._panels_cache is not None
+
+
+@pytest.mark.parametrize("attribute", ['hsep', 'vsep', 'padleft', 'padright',
+                                       'padtop', 'padbottom', 'panelwidth',
+                                       'panelheight'])
+def test_mutation_invalidates_layout(attribute):
+    l = PanelSizeLocator(3, 4, 10, 5, hsep=2, vsep=1)
+    figsize = l.figsize_in('mm')
+    positions = l.panel_positions()
+    setattr(l, attribute, getattr(l, attribute) + 3)
+    expected = PanelSizeLocator(3, 4, l.panelwidth, l.panelheight,
+                                hsep=l.hsep, vsep=l.vsep, padleft=l.padleft,
+                                padright=l.padright, padtop=l.padtop,
+                                padbottom=l.padbottom)
+    assert l.figsize_in('mm') != figsize
+    assert l.figsize_in('mm') == expected.figsize_in('mm')
+    assert l.figwidth == expected.figwidth
+    assert l.panelwidth_fig == expected.panelwidth_fig
+    assert (l.panel_positions() != positions).any()
+    assert l.panel_position(2, 3) == expected.panel_position(2, 3)
+
+
+def test_mutation_of_units_invalidates_figsize():
+    l = PanelSizeLocator(1, 1, 25.4, 25.4)
+    assert l.figsize == (1, 1)
+    l.units = 'inches'
+    assert l.figsize == (25.4, 25.4)
+
+
+#-----------------------------------------------------------------------
+# Tests for specifying units with constants.
+#-----------------------------------------------------------------------
+
+@pytest.mark.parametrize("units", TEST_UNITS)
+def test_unit_constants(units):
+    l = PanelSizeLocator(2, 3, 10, 20, hsep=1, units=units)
+    u = PanelSizeLocator(2, 3, 10, 20, hsep=1, units=Unit(units))
+    assert l.figsize == u.figsize
+    assert l.figsize_in(units) == u.figsize_in(Unit(units))
+
+
+#-----------------------------------------------------------------------
+# Tests for fixed-point geometry.
+#-----------------------------------------------------------------------
+
+@given(rows=gridsize_st, columns=gridsize_st, panelwidth=length_st,
+       panelheight=length_st, hsep=offset_st, vsep=offset_st,
+       padleft=offset_st, padtop=offset_st)
+def test_quantum_close_to_float(rows, columns, panelwidth, panelheight, hsep,
+                                vsep, padleft, padtop):
+    """Fixed-point positions are close to floating-point positions."""
+    assume(min(panelwidth, panelheight) > 1)
+    kwargs = dict(hsep=hsep, vsep=vsep, padleft=padleft, padtop=padtop)
+    l = PanelSizeLocator(rows, columns, panelwidth, panelheight, **kwargs)
+    q = PanelSizeLocator(rows, columns, panelwidth, panelheight,
+                         quantum=0.001, **kwargs)
+    assert np.allclose(q.panel_positions(), l.panel_positions(), atol=1e-5)
+    check_panels_in_figure(q)
+
+
+@given(rows=gridsize_st, columns=gridsize_st)
+def test_quantum_edges_on_grid(rows, columns):
+    """Fixed-point panel edges are whole multiples of the quantum."""
+    quantum = 0.01
+    l = PanelSizeLocator(rows, columns, 10.123, 7.891, hsep=1.2345,
+                         vsep=0.333, padleft=2.22, padtop=3.14159,
+                         quantum=quantum)
+    figwidth, figheight = l.figsize_in('mm')
+    positions = l.panel_positions()
+    for edges, size in ((positions[..., 0], figwidth),
+                        (positions[..., 1], figheight)):
+        quanta = edges * size / quantum
+        assert np.allclose(quanta, np.round(quanta), rtol=0, atol=1e-6)
+
+
+def test_quantum_invalidates_layout():
+    l = PanelSizeLocator(1, 2, 1.26, 1, hsep=0.12)
+    assert l.figwidth == 1.26 * 2 + 0.12
+    l.quantum = 0.1
+    assert almost_equal(l.figwidth, 2.7)
+
+
+@pytest.mark.parametrize("quantum", [0, -0.001])
+def test_quantum_not_positive(quantum):
+    with pytest.raises(ValueError):
+        PanelSizeLocator(2, 2, 10, 10, quantum=quantum)
+    with pytest.raises(ValueError):
+        FigureSizeLocator(2, 2, figwidth=100, quantum=quantum)
+    with pytest.raises(ValueError):
+        FrozenPanelSizeLocator(2, 2, 10, 10, quantum=quantum)
+
+
+def test_quantum_larger_than_panel():
+    with pytest.raises(ValueError):
+        PanelSizeLocator(2, 2, 0.0004, 1, quantum=0.001)
+    with pytest.raises(ValueError):
+        FrozenPanelSizeLocator(2, 2, 1, 0.0004, quantum=0.001)
+    with pytest.raises(ValueError):
+        FigureSizeLocator(2, 2, figwidth=0.0008, figheight=1, quantum=0.001)
+    l = PanelSizeLocator(2, 2, 1, 1, quantum=0.001)
+    l.panelwidth = 0.0004
+    with pytest.raises(ValueError):
+        l.figsize
+
+
+#-----------------------------------------------------------------------
+# Tests for pixel geometry.
+#-----------------------------------------------------------------------
+
+@given(rows=gridsize_st, columns=gridsize_st, hsep=offset_st, vsep=offset_st,
+       padleft=offset_st, padtop=offset_st)
+@example(rows=1, columns=8, hsep=0.3604515035, vsep=0, padleft=0.3604515035,
+         padtop=0)
+def test_pixel_boxes(rows, columns, hsep, vsep, padleft, padtop):
+    l = PanelSizeLocator(rows, columns, 10, 7, hsep=hsep % 10,
+                         vsep=vsep % 10, padleft=padleft % 10,
+                         padtop=padtop % 10)
+    width, height = l.figsize_px(150)
+    boxes = l.panel_pixel_boxes(150)
+    assert boxes.shape == (rows, columns, 4)
+    left, top, right, bottom = (boxes[..., i] for i in range(4))
+    assert (left >= 0).all() and (right <= width).all()
+    assert (top >= 0).all() and (bottom <= height).all()
+    assert (right[:, :-1] <= left[:, 1:]).all()
+    assert (bottom[:-1] <= top[1:]).all()
+    assert (abs(right - left - 10 * 150 / 25.4) <= 1).all()
+    assert (abs(bottom - top - 7 * 150 / 25.4) <= 1).all()
+
+
+def test_pixel_boxes_exact():
+    l = PanelSizeLocator(2, 3, 1, 0.5, hsep=0.25, padtop=0.5, units='inches')
+    assert l.figsize_px(100) == (350, 150)
+    assert l.panel_pixel_boxes(100).tolist() == [
+        [[0, 50, 100, 100], [125, 50, 225, 100], [250, 50, 350, 100]],
+        [[0, 100, 100, 150], [125, 100, 225, 150], [250, 100, 350, 150]]]
+    assert l.panel_pixel_boxes(100, order='column', flatten=True)[1].tolist() \
+        == [0, 100, 100, 150]
+
+
+#-----------------------------------------------------------------------
+# Tests snapping geometry to device units.
+#-----------------------------------------------------------------------
+
+def check_snapped(locator, dpi):
+    """Check every panel edge and the figure size fall on device units."""
+    width, height = (np.array(locator.figsize) * dpi).tolist()
+    assert almost_equal(width, round(width), rtol=0, atol=1e-6)
+    assert almost_equal(height, round(height), rtol=0, atol=1e-6)
+    positions = locator.panel_positions()
+    edges = np.concatenate([positions[..., [0, 2]].ravel() * round(width),
+                            positions[..., [1, 3]].ravel() * round(height)])
+    assert (abs(edges - np.rint(edges)) < 1e-6).all()
+
+
+@pytest.mark.parametrize("units", TEST_UNITS)
+@pytest.mark.parametrize("dpi", [72, 96, 300, 600])
+@given(rows=gridsize_st, columns=gridsize_st, hsep=offset_st, vsep=offset_st,
+       padleft=offset_st, padtop=offset_st)
+def test_snap(units, dpi, rows, columns, hsep, vsep, padleft, padtop):
+    l = PanelSizeLocator(rows, columns, 7.3, 5.1, hsep=hsep % 3,
+                         vsep=vsep % 3, padleft=padleft % 3,
+                         padtop=padtop % 3, units=units, snap=dpi)
+    check_snapped(l, dpi)
+    boxes = l.panel_pixel_boxes(dpi)
+    assert len(set((boxes[..., 2] - boxes[..., 0]).ravel())) == 1
+    assert len(set((boxes[..., 3] - boxes[..., 1]).ravel())) == 1
+
+
+def test_snap_is_minimal():
+    l = PanelSizeLocator(1, 2, 1.004, 0.5, hsep=0.254, units='inches',
+                         snap=100)
+    assert l.figsize_px(100) == (225, 50)
+    assert l.panel_pixel_boxes(100).tolist() == [[[0, 0, 100, 50],
+                                                  [125, 0, 225, 50]]]
+
+
+def test_snap_invalid():
+    with pytest.raises(ValueError):
+        PanelSizeLocator(2, 2, 10, 10, quantum=0.1, snap=72)
+    with pytest.raises(ValueError):
+        PanelSizeLocator(2, 2, 10, 10, snap=0)
+
+
+#-----------------------------------------------------------------------
+# Tests spanning panels.
+#-----------------------------------------------------------------------
+
+@given(rows=gridsize_st, columns=gridsize_st, hsep=offset_st, vsep=offset_st)
+def test_span_of_one_cell(rows, columns, hsep, vsep):
+    l = PanelSizeLocator(rows, columns, 10, 7, hsep=hsep % 10,
+                         vsep=vsep % 10)
+    row, column = rows // 2, columns // 2
+    assert np.allclose(l.span_position(row, column),
+                       l.panel_position(row, column), rtol=0, atol=1e-12)
+
+
+def test_span_position():
+    l = PanelSizeLocator(3, 4, 10, 5, hsep=2, vsep=1, padleft=3, padbottom=2)
+    x, y, w, h = l.span_position(slice(1, 3), slice(0, 2))
+    figwidth, figheight = l.figsize_in('mm')
+    assert almost_equal(x * figwidth, 3)
+    assert almost_equal(y * figheight, 2)
+    assert almost_equal(w * figwidth, 22)
+    assert almost_equal(h * figheight, 11)
+    assert l.span_position(slice(None), slice(None)) == pytest.approx(
+        (3 / figwidth, 2 / figheight, 46 / figwidth, 17 / figheight))
+    assert l.span_position(-1, slice(-2, None)) == pytest.approx(
+        l.span_position(2, slice(2, 4)))
+
+
+def test_span_position_invalid():
+    l = PanelSizeLocator(3, 4, 10, 5)
+    with pytest.raises(ValueError):
+        l.span_position(slice(2, 1), 0)
+    with pytest.raises(ValueError):
+        l.span_position(0, slice(0, 4, 2))
+    with pytest.raises(IndexError):
+        l.span_position(3, 0)
+
+
+def test_mosaic_positions():
+    l = PanelSizeLocator(2, 3, 10, 5, hsep=2, vsep=1)
+    positions = l.mosaic_positions("""
+        AAB
+        C.B
+    """)
+    assert list(positions) == ['A', 'B', 'C']
+    assert positions['A'] == l.span_position(0, slice(0, 2))
+    assert positions['B'] == l.span_position(slice(0, 2), 2)
+    assert positions['C'] == pytest.approx(l.panel_position(1, 0))
+    assert l.mosaic_positions(['AAB', 'C.B']) == positions
+
+
+def test_mosaic_cached():
+    clear_locator_caches()
+    l = PanelSizeLocator(2, 2, 10, 5)
+    for _ in range(3):
+        l.mosaic_positions('AB\nCC')
+    info = locator_cache_info()['mosaic']
+    assert (info.hits, info.misses) == (2, 1)
+
+
+@pytest.mark.parametrize('mosaic', ['AB\nBA', 'AAB\nAB', 'AB\nCD\nEF', '',
+                                    'ABC\nDEF'])
+def test_mosaic_invalid(mosaic):
+    l = PanelSizeLocator(2, 2, 10, 5)
+    with pytest.raises(ValueError):
+        l.mosaic_positions(mosaic)
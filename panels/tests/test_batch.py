@@ -0,0 +1,59 @@
+"""Tests for rendering batches of figures."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import matplotlib.image
+import pytest
+
+from panels import FigureSizeLocator, render_batch
+
+
+def draw_lines(fig, locator, data):
+    for ax, y in zip(locator.create_axes(fig).ravel(), data):
+        ax.plot(y)
+
+
+def draw_failure(fig, locator, data):
+    raise RuntimeError('cannot draw {}'.format(data))
+
+
+@pytest.fixture
+def locator():
+    return FigureSizeLocator(2, 2, figwidth=60, hsep=5, vsep=5, units='mm')
+
+
+def test_render_batch(locator, tmp_path):
+    jobs = [([[0, n], [n, 0], [1, 1], [n, n]], draw_lines,
+             str(tmp_path / 'figure{}.png'.format(n))) for n in range(5)]
+    results = render_batch(locator, jobs, max_workers=2, dpi=50)
+    assert [result.path for result in results] == [job[2] for job in jobs]
+    for result in results:
+        assert result.error is None
+        assert result.seconds > 0
+        image = matplotlib.image.imread(result.path)
+        assert image.shape[:2] == locator.figsize_px(50)[::-1]
+
+
+def test_render_batch_errors(locator, tmp_path):
+    jobs = [([[0, 1]] * 4, draw_lines, str(tmp_path / 'good.png')),
+            ('bad data', draw_failure, str(tmp_path / 'bad.png'))]
+    good, bad = render_batch(locator, jobs, max_workers=1, dpi=50)
+    assert good.error is None
+    assert 'cannot draw bad data' in bad.error
+    assert not (tmp_path / 'bad.png').exists()
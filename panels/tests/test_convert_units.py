@@ -18,9 +18,15 @@
 
 from __future__ import (absolute_import, division, print_function)
 
+from decimal import Decimal
+
 from hypothesis import assume, given
+from hypothesis.strategies import lists
+import numpy as np
+import pytest
 
-from panels._units import convert_units
+from panels._units import (Unit, convert_units, conversion_factor,
+                           unit_converter, _normalize_units)
 from panels.tests import almost_equal, offset_st, unit_st
 
 
@@ -31,6 +37,21 @@ def test_identity(value, units):
     assert converted == value
 
 
+@pytest.mark.parametrize('value', [5, Decimal('2.5')])
+def test_identity_preserves_scalars(value):
+    """Scalars converted to the same unit are returned unchanged."""
+    assert convert_units(value, 'mm', 'Millimetres') is value
+    assert unit_converter('inches', Unit.INCHES)(value) is value
+
+
+def test_identity_with_out():
+    """Converting to the same unit with `out` still fills the array."""
+    out = np.empty(2)
+    converted = convert_units([5, 6], 'mm', 'mm', out=out)
+    assert converted is out
+    assert (out == [5, 6]).all()
+
+
 @given(value=offset_st, source_units=unit_st, target_units=unit_st)
 def test_roundtrip(value, source_units, target_units):
     """Round-trip conversion should not change the value."""
@@ -85,3 +106,85 @@ def test_inches_less_than_cm(value):
     assume(value > 0)
     converted = convert_units(value, 'inches', 'cm')
     assert value < converted
+
+
+@given(values=lists(offset_st, min_size=1, max_size=20),
+       source_units=unit_st, target_units=unit_st)
+def test_array_matches_scalar(values, source_units, target_units):
+    """Converting an array is the same as converting each element."""
+    converted = convert_units(np.array(values), source_units, target_units)
+    assert isinstance(converted, np.ndarray)
+    assert converted.shape == (len(values),)
+    for c, value in zip(converted, values):
+        assert almost_equal(c, convert_units(value, source_units,
+                                             target_units))
+
+
+@given(source_units=unit_st, target_units=unit_st)
+def test_sequence_gives_array(source_units, target_units):
+    """Converting a sequence gives an array."""
+    converted = convert_units([1, 2, 3], source_units, target_units)
+    assert isinstance(converted, np.ndarray)
+    assert converted.shape == (3,)
+
+
+@given(value=offset_st, source_units=unit_st, target_units=unit_st)
+def test_scalar_gives_scalar(value, source_units, target_units):
+    """Converting a scalar gives a scalar."""
+    converted = convert_units(value, source_units, target_units)
+    assert np.isscalar(converted)
+
+
+@given(source_units=unit_st, target_units=unit_st)
+def test_convert_in_place(source_units, target_units):
+    """Converting with `out` writes into the given array."""
+    values = np.array([[1., 2.], [3., 4.]])
+    expected = convert_units(values, source_units, target_units)
+    converted = convert_units(values, source_units, target_units, out=values)
+    assert converted is values
+    assert (values == expected).all()
+
+
+@given(value=offset_st, source_units=unit_st, target_units=unit_st)
+def test_converter_matches_convert_units(value, source_units, target_units):
+    """A compiled converter gives the same result as `convert_units`."""
+    converter = unit_converter(source_units, target_units)
+    factor = conversion_factor(source_units, target_units)
+    expected = convert_units(value, source_units, target_units)
+    assert converter(value) == expected
+    assert almost_equal(value * factor, expected)
+
+
+def test_converter_with_arrays():
+    """A compiled converter supports arrays and the `out` keyword."""
+    converter = unit_converter('inches', 'Millimetres')
+    values = np.array([1., 2.])
+    assert (converter(values) == [25.4, 50.8]).all()
+    converter(values, out=values)
+    assert (values == [25.4, 50.8]).all()
+
+
+def test_conversion_factor_unknown_units():
+    """Unknown units cannot be converted."""
+    with pytest.raises(KeyError):
+        conversion_factor('mm', 'furlongs')
+
+
+@pytest.mark.parametrize('spelling,unit', [
+    ('mm', Unit.MM), ('Millimetres', Unit.MM), ('MILLIMETERS', Unit.MM),
+    ('cm', Unit.CM), ('centimetre', Unit.CM),
+    ('inches', Unit.INCHES), ('Inch', Unit.INCHES),
+    (Unit.MM, Unit.MM), (Unit.INCHES, Unit.INCHES),
+])
+def test_normalize_units(spelling, unit):
+    """Unit spellings normalize to canonical units."""
+    for _ in range(2):
+        normed = _normalize_units(spelling)
+        assert normed is unit
+
+
+@given(value=offset_st, source_units=unit_st, target_units=unit_st)
+def test_unit_constants(value, source_units, target_units):
+    """Unit constants convert the same way as strings."""
+    converted = convert_units(value, Unit(source_units), Unit(target_units))
+    assert converted == convert_units(value, source_units, target_units)
@@ -0,0 +1,171 @@
+"""Tests for creating axes from locators."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.projections.polar import PolarAxes
+from matplotlib.text import Text
+import numpy as np
+import pytest
+
+from panels import FigureSizeLocator, FrozenPanelSizeLocator
+
+
+@pytest.fixture(params=['mutable', 'frozen'])
+def locator(request):
+    if request.param == 'mutable':
+        return FigureSizeLocator(3, 4, figwidth=160, hsep=5, vsep=5,
+                                 padleft=10, padbottom=10)
+    return FrozenPanelSizeLocator(3, 4, 30, 20, hsep=5, vsep=5, padleft=10,
+                                  padbottom=10)
+
+
+def test_axes_positions(locator):
+    fig = Figure(figsize=locator.figsize)
+    axes = locator.create_axes(fig)
+    assert axes.shape == (3, 4)
+    assert list(fig.axes) == list(axes.ravel())
+    for row in range(3):
+        for column in range(4):
+            bounds = axes[row, column].get_position().bounds
+            assert np.allclose(bounds, locator.panel_position(row, column))
+
+
+def test_projection(locator):
+    fig = Figure(figsize=locator.figsize)
+    axes = locator.create_axes(fig, projection='polar')
+    assert all(isinstance(ax, PolarAxes) for ax in axes.ravel())
+
+
+@pytest.mark.parametrize('share', ['row', 'col', 'all', True])
+def test_sharing(locator, share):
+    fig = Figure(figsize=locator.figsize)
+    axes = locator.create_axes(fig, sharex=share, sharey=share)
+    axes[1, 2].set_xlim(0, 7)
+    axes[1, 2].set_ylim(0, 3)
+    for row in range(3):
+        for column in range(4):
+            ax = axes[row, column]
+            xshared = (share in ('all', True) or
+                       (share == 'row' and row == 1) or
+                       (share == 'col' and column == 2))
+            assert (ax.get_xlim() == (0, 7)) == xshared
+            assert (ax.get_ylim() == (0, 3)) == xshared
+
+
+def test_no_sharing(locator):
+    fig = Figure(figsize=locator.figsize)
+    axes = locator.create_axes(fig)
+    axes[0, 0].set_xlim(0, 7)
+    assert axes[0, 1].get_xlim() != (0, 7)
+
+
+def test_invalid_sharing(locator):
+    fig = Figure(figsize=locator.figsize)
+    with pytest.raises(ValueError):
+        locator.create_axes(fig, sharex='diagonal')
+
+
+def test_tick_params_and_kwargs(locator):
+    fig = Figure(figsize=locator.figsize)
+    axes = locator.create_axes(fig, tick_params={'labelsize': 3},
+                               facecolor='red')
+    for ax in axes.ravel():
+        assert ax.xaxis.get_major_ticks()[0].label1.get_fontsize() == 3
+        assert ax.get_facecolor() == (1, 0, 0, 1)
+
+
+def visible_text_count(fig):
+    FigureCanvasAgg(fig).draw()
+    return sum(1 for text in fig.findobj(Text)
+               if text.get_visible() and text.get_text())
+
+
+def test_label_outer(locator):
+    fig = Figure(figsize=locator.figsize)
+    axes = locator.create_axes(fig, label_outer=True)
+    for row in range(3):
+        for column in range(4):
+            ax = axes[row, column]
+            xlabels = [t for t in ax.get_xticklabels() if t.get_visible()]
+            ylabels = [t for t in ax.get_yticklabels() if t.get_visible()]
+            assert bool(xlabels) == (row == 2)
+            assert bool(ylabels) == (column == 0)
+    axes[0, 1].set_xlim(0, 7)
+    axes[0, 1].set_ylim(0, 3)
+    assert axes[2, 1].get_xlim() == (0, 7)
+    assert axes[0, 3].get_ylim() == (0, 3)
+    assert axes[1, 2].get_xlim() != (0, 7)
+    assert axes[1, 3].get_ylim() != (0, 3)
+
+
+def test_label_outer_explicit_no_sharing(locator):
+    """Explicitly unshared axes keep their own tick labels."""
+    fig = Figure(figsize=locator.figsize)
+    axes = locator.create_axes(fig, sharex=False, sharey='none',
+                               label_outer=True)
+    axes[0, 0].set_xlim(0, 7)
+    axes[0, 0].set_ylim(0, 3)
+    assert axes[2, 0].get_xlim() != (0, 7)
+    assert axes[0, 1].get_ylim() != (0, 3)
+    for ax in axes.ravel():
+        assert any(t.get_visible() for t in ax.get_xticklabels())
+        assert any(t.get_visible() for t in ax.get_yticklabels())
+
+
+def test_label_outer_share_rows(locator):
+    """
+    Axes shared within rows keep their x tick labels, and y tick labels
+    are only drawn on the left column.
+
+    """
+    fig = Figure(figsize=locator.figsize)
+    axes = locator.create_axes(fig, sharex='row', label_outer=True)
+    axes[0, 0].set_xlim(0, 7)
+    assert axes[0, 3].get_xlim() == (0, 7)
+    assert axes[2, 0].get_xlim() != (0, 7)
+    for row in range(3):
+        for column in range(4):
+            ax = axes[row, column]
+            assert any(t.get_visible() for t in ax.get_xticklabels())
+            ylabels = [t for t in ax.get_yticklabels() if t.get_visible()]
+            assert bool(ylabels) == (column == 0)
+
+
+def test_label_outer_reduces_text():
+    locator = FrozenPanelSizeLocator(4, 4, 30, 20, hsep=5, vsep=5)
+    fig = Figure(figsize=locator.figsize)
+    locator.create_axes(fig)
+    fig_outer = Figure(figsize=locator.figsize)
+    locator.create_axes(fig_outer, label_outer=True)
+    assert visible_text_count(fig_outer) < visible_text_count(fig) / 2
+
+
+@pytest.mark.parametrize('hsep,vsep', [(0, 0), (0, 5), (5, 0), (5, 5)])
+def test_label_outer_spines(hsep, vsep):
+    locator = FrozenPanelSizeLocator(2, 2, 30, 20, hsep=hsep, vsep=vsep)
+    fig = Figure(figsize=locator.figsize)
+    axes = locator.create_axes(fig, label_outer=True)
+    assert axes[0, 0].spines['left'].get_visible()
+    assert axes[0, 0].spines['top'].get_visible()
+    assert axes[0, 1].spines['left'].get_visible() == (hsep != 0)
+    assert axes[1, 0].spines['top'].get_visible() == (vsep != 0)
+    assert axes[1, 1].spines['right'].get_visible()
+    assert axes[1, 1].spines['bottom'].get_visible()
@@ -0,0 +1,82 @@
+"""Tests for figure-level panel decorations."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+import pytest
+
+from panels import (PanelSizeLocator, hide_axes_decorations,
+                    panel_decorations)
+
+
+@pytest.fixture
+def locator():
+    return PanelSizeLocator(2, 3, 30, 20, hsep=5, vsep=5, padleft=10,
+                            padbottom=10)
+
+
+def test_panels(locator):
+    fig = Figure(figsize=locator.figsize)
+    decorations = panel_decorations(locator, fig, facecolor='red')
+    assert decorations.gridlines is None
+    assert decorations.panels in fig.artists
+    paths = decorations.panels.get_paths()
+    assert len(paths) == 6
+    x, y, w, h = locator.panel_position(1, 2)
+    extents = paths[5].get_extents().bounds
+    assert np.allclose(extents, (x, y, w, h))
+    assert (decorations.panels.get_facecolor() == (1, 0, 0, 1)).all()
+
+
+def test_gridlines(locator):
+    fig = Figure(figsize=locator.figsize)
+    decorations = panel_decorations(locator, fig, xgrid=[0.25, 0.75],
+                                    ygrid=[0.5], grid_kw={'colors': 'b'})
+    segments = decorations.gridlines.get_segments()
+    assert len(segments) == 6 * 3
+    x, y, w, h = locator.panel_position(0, 0)
+    assert np.allclose(segments[0], [[x + w / 4, y], [x + w / 4, y + h]])
+    assert np.allclose(segments[12], [[x, y + h / 2], [x + w, y + h / 2]])
+    assert decorations.gridlines.zorder > decorations.panels.zorder
+
+
+def test_render_behind_axes(locator):
+    fig = Figure(figsize=locator.figsize, dpi=50)
+    canvas = FigureCanvasAgg(fig)
+    panel_decorations(locator, fig, facecolor='red', edgecolor='none')
+    axes = locator.create_axes(fig)
+    hide_axes_decorations(axes)
+    for ax in axes.ravel():
+        ax.set_axis_off()
+    canvas.draw()
+    image = np.asarray(canvas.buffer_rgba())
+    left, top, right, bottom = locator.panel_pixel_boxes(50)[1, 1]
+    centre = image[(top + bottom) // 2, (left + right) // 2]
+    assert tuple(centre) == (255, 0, 0, 255)
+
+
+def test_hide_axes_decorations(locator):
+    fig = Figure(figsize=locator.figsize)
+    axes = locator.create_axes(fig)
+    hide_axes_decorations(axes)
+    for ax in axes.ravel():
+        assert not ax.patch.get_visible()
+        assert not any(spine.get_visible() for spine in ax.spines.values())
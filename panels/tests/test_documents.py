@@ -0,0 +1,143 @@
+"""Tests for writing panels to multi-page documents."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from functools import partial
+import re
+
+import matplotlib.image
+import numpy as np
+import pytest
+
+from panels import FigureSizeLocator, merge_pdf, render_pages, write_pdf
+from panels._documents import _read_pdf
+
+
+def plot(n, ax):
+    ax.plot([0, n], [n, 0])
+
+
+def pdf_page_sizes(path):
+    """The (width, height) in points of each page of a PDF file."""
+    with open(path, 'rb') as f:
+        content = f.read()
+    return [tuple(float(x) for x in box.split()[2:])
+            for box in re.findall(rb'/MediaBox \[([^\]]*)\]', content)]
+
+
+@pytest.fixture
+def locator():
+    return FigureSizeLocator(3, 2, figwidth=4, figheight=6, hsep=0.5,
+                             vsep=0.5, units='inches')
+
+
+def test_write_pdf(locator, tmp_path):
+    path = str(tmp_path / 'panels.pdf')
+    draws = (partial(plot, n) for n in range(15))
+    results = write_pdf(locator, draws, path)
+    assert [r.number for r in results] == [0, 1, 2]
+    assert [r.indices for r in results] == [range(0, 6), range(6, 12),
+                                            range(12, 15)]
+    assert all(r.seconds > 0 for r in results)
+    assert pdf_page_sizes(path) == [(288, 432)] * 3
+
+
+def test_write_pdf_shrink_last(locator, tmp_path):
+    path = str(tmp_path / 'panels.pdf')
+    draws = [partial(plot, n) for n in range(15)]
+    write_pdf(locator, draws, path, shrink_last=True)
+    assert pdf_page_sizes(path) == [(288, 432)] * 2 + [(288, 276)]
+
+
+def test_write_pdf_exact_pages(locator, tmp_path):
+    path = str(tmp_path / 'panels.pdf')
+    results = write_pdf(locator, [partial(plot, n) for n in range(12)], path,
+                        shrink_last=True)
+    assert len(results) == 2
+    assert pdf_page_sizes(path) == [(288, 432)] * 2
+
+
+def test_write_pdf_draw_order(locator, tmp_path):
+    positions = []
+    draws = [lambda ax: positions.append(tuple(ax.get_position().bounds))
+             for _ in range(6)]
+    write_pdf(locator, draws, str(tmp_path / 'panels.pdf'), order='column')
+    expected = [locator.panel_position(r, c) for c in range(2)
+                for r in range(3)]
+    assert np.allclose(positions, expected)
+
+
+def plot_index(ax, index):
+    ax.set_title(str(index))
+    ax.plot([0, index])
+
+
+def check_pdf(path):
+    """
+    Check every cross-reference of a PDF file points at its object, and
+    return the page objects in order.
+
+    """
+    objects, root, info = _read_pdf(path)
+    pages = int(re.search(rb'/Pages (\d+) 0 R', objects[root]).group(1))
+    kids = re.search(rb'/Kids \[([^\]]*)\]', objects[pages]).group(1)
+    kids = [int(kid) for kid in re.findall(rb'(\d+) 0 R', kids)]
+    count = int(re.search(rb'/Count (\d+)', objects[pages]).group(1))
+    assert count == len(kids)
+    for number in kids:
+        assert b'/Type /Page ' in objects[number]
+        assert b'/Parent %d 0 R' % pages in objects[number]
+    for body in objects.values():
+        head = body.split(b'stream')[0]
+        for reference in re.findall(rb'(\d+) 0 R\b', head):
+            assert int(reference) in objects
+    return [objects[number] for number in kids]
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_render_pages_pdf(locator, tmp_path, max_workers):
+    path = str(tmp_path / 'panels.pdf')
+    results = render_pages(locator, plot_index, 15, path,
+                           max_workers=max_workers, shrink_last=True)
+    assert [r.indices for r in results] == [range(0, 6), range(6, 12),
+                                            range(12, 15)]
+    assert len(check_pdf(path)) == 3
+    assert pdf_page_sizes(path) == [(288, 432)] * 2 + [(288, 276)]
+    assert [p.name for p in tmp_path.iterdir()] == ['panels.pdf']
+
+
+def test_render_pages_png(locator, tmp_path):
+    pattern = str(tmp_path / 'page{}.png')
+    render_pages(locator, plot_index, 8, pattern, format='png', dpi=20,
+                 max_workers=1)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['page0.png',
+                                                         'page1.png']
+    assert matplotlib.image.imread(pattern.format(1)).shape[:2] == (120, 80)
+
+
+def test_merge_pdf(locator, tmp_path):
+    first, second = str(tmp_path / 'first.pdf'), str(tmp_path / 'second.pdf')
+    write_pdf(locator, [partial(plot, n) for n in range(12)], first)
+    small = FigureSizeLocator(1, 1, figwidth=2, figheight=1, units='inches')
+    write_pdf(small, [partial(plot, 1)], second)
+    merged = str(tmp_path / 'merged.pdf')
+    merge_pdf([first, second, first], merged)
+    assert len(check_pdf(merged)) == 5
+    assert pdf_page_sizes(merged) == [(288, 432)] * 2 + [(144, 72)] + \
+        [(288, 432)] * 2
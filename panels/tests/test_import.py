@@ -0,0 +1,97 @@
+"""Tests for importing `panels`."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import os.path
+import subprocess
+import sys
+
+import pytest
+
+import panels
+
+
+#: The directory containing the panels package being tested.
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(panels.__file__))
+
+
+def run_python(code):
+    """Run Python code in a fresh interpreter, returning its output."""
+    return subprocess.check_output([sys.executable, '-c', code],
+                                   cwd=PACKAGE_ROOT,
+                                   stderr=subprocess.STDOUT).decode()
+
+
+def test_import_spawns_no_subprocess():
+    code = '\n'.join([
+        'import os, subprocess, sys',
+        'def fail(*args, **kwargs):',
+        '    raise AssertionError("subprocess spawned by import")',
+        'subprocess.Popen = fail',
+        'os.system = os.popen = fail',
+        'if hasattr(os, "posix_spawn"):',
+        '    os.posix_spawn = os.posix_spawnp = fail',
+        'import panels',
+        'assert "panels._version" not in sys.modules',
+    ])
+    run_python(code)
+
+
+def test_version_resolved_on_access():
+    assert isinstance(panels.__version__, str)
+    assert panels.__version__
+
+
+#: The maximum time in milliseconds a bare `import panels` may take.
+IMPORT_TIME_BUDGET_MS = 50
+
+
+def test_import_is_lazy():
+    code = '\n'.join([
+        'import sys',
+        'import panels',
+        'assert "panels._locators" not in sys.modules',
+        'assert "numpy" not in sys.modules',
+        'assert "matplotlib" not in sys.modules',
+        'from panels import PanelSizeLocator',
+        'assert "panels._locators" in sys.modules',
+    ])
+    run_python(code)
+
+
+def test_import_time_budget():
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', 'import panels'],
+        cwd=PACKAGE_ROOT, stderr=subprocess.STDOUT).decode()
+    for line in output.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == 'panels':
+            cumulative_us = int(fields[1])
+            break
+    else:
+        raise AssertionError('no import time reported for panels')
+    assert cumulative_us / 1000 < IMPORT_TIME_BUDGET_MS
+
+
+def test_lazy_attributes():
+    for name in panels.__all__:
+        assert getattr(panels, name) is not None
+        assert name in dir(panels)
+    with pytest.raises(AttributeError):
+        panels.not_an_attribute
@@ -0,0 +1,124 @@
+"""Tests for image mosaics."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+import pytest
+
+from panels import PanelSizeLocator, figimage_mosaic, image_mosaic
+
+
+#: The resolution mosaics are tested at.
+DPI = 64
+
+#: A locator whose panels fall exactly on pixels at the test resolution.
+REGULAR = PanelSizeLocator(2, 3, 1.5, 0.75, hsep=0.125, vsep=0.25,
+                           padleft=0.25, padtop=0.125, units='inches')
+
+#: A locator whose panels do not fall on pixels at the test resolution.
+IRREGULAR = PanelSizeLocator(3, 2, 11.3, 7.7, hsep=1.1, vsep=0.9,
+                             padright=3.3)
+
+
+def panel_images(locator, dpi, order='row', channels=()):
+    """Constant images of the right size for each panel."""
+    boxes = locator.panel_pixel_boxes(dpi, order=order, flatten=True)
+    return [np.full((b - t, r - l) + channels, n + 1, dtype=np.uint8)
+            for n, (l, t, r, b) in enumerate(boxes)]
+
+
+def check_mosaic(mosaic, locator, dpi, order='row'):
+    boxes = locator.panel_pixel_boxes(dpi, order=order, flatten=True)
+    covered = np.zeros(mosaic.shape[:2], dtype=bool)
+    for n, (left, top, right, bottom) in enumerate(boxes):
+        assert (mosaic[top:bottom, left:right] == n + 1).all()
+        covered[top:bottom, left:right] = True
+    assert (mosaic[~covered] == 0).all()
+
+
+@pytest.mark.parametrize('locator', [REGULAR, IRREGULAR])
+@pytest.mark.parametrize('order', ['row', 'column'])
+def test_mosaic(locator, order):
+    images = panel_images(locator, DPI, order=order)
+    mosaic = image_mosaic(locator, images, DPI, order=order)
+    assert mosaic.shape == locator.figsize_px(DPI)[::-1]
+    assert mosaic.dtype == np.uint8
+    check_mosaic(mosaic, locator, DPI, order=order)
+
+
+@pytest.mark.parametrize('order', ['row', 'column'])
+def test_mosaic_stacked(order):
+    images = np.stack(panel_images(REGULAR, DPI, order=order,
+                                   channels=(3,)))
+    mosaic = image_mosaic(REGULAR, images, DPI, order=order)
+    assert mosaic.shape == REGULAR.figsize_px(DPI)[::-1] + (3,)
+    check_mosaic(mosaic, REGULAR, DPI, order=order)
+
+
+def test_mosaic_resamples():
+    images = [np.array([[1, 2], [3, 4]], dtype=np.uint8)] * 6
+    mosaic = image_mosaic(REGULAR, images, DPI)
+    left, top, right, bottom = REGULAR.panel_pixel_boxes(DPI)[1, 2]
+    panel = mosaic[top:bottom, left:right]
+    assert panel.shape == (48, 96)
+    assert (panel[:24, :48] == 1).all()
+    assert (panel[24:, 48:] == 4).all()
+
+
+def test_mosaic_background_and_out():
+    out = np.empty(REGULAR.figsize_px(DPI)[::-1] + (3,), dtype=np.float32)
+    images = panel_images(REGULAR, DPI, channels=(3,))[:2]
+    mosaic = image_mosaic(REGULAR, images, DPI, background=(1, 0, 0),
+                          out=out)
+    assert mosaic is out
+    assert (mosaic[0, 0] == (1, 0, 0)).all()
+    left, top, right, bottom = REGULAR.panel_pixel_boxes(DPI)[1, 0]
+    assert (mosaic[top:bottom, left:right] == (1, 0, 0)).all()
+
+
+def test_mosaic_errors():
+    with pytest.raises(ValueError):
+        image_mosaic(REGULAR, [np.zeros((2, 2))] * 7, DPI)
+    with pytest.raises(ValueError):
+        image_mosaic(REGULAR, [], DPI)
+
+
+@pytest.mark.parametrize('shape', [(10, 10), (10, 10, 3)])
+def test_mosaic_out_wrong_shape(shape):
+    """A wrong-sized out is rejected before anything is written to it."""
+    locator = PanelSizeLocator(4, 4, 1, 1, units='inches')
+    images = np.ones((16, 100, 100), dtype=np.uint8)
+    out = np.zeros(shape, dtype=np.uint8)
+    with pytest.raises(ValueError):
+        image_mosaic(locator, images, 100, out=out)
+    assert not out.any()
+
+
+def test_figimage_mosaic():
+    fig = Figure(figsize=REGULAR.figsize, dpi=DPI)
+    canvas = FigureCanvasAgg(fig)
+    images = panel_images(REGULAR, DPI, channels=(3,))
+    images = [(image * 40).astype(np.uint8) for image in images]
+    figimage_mosaic(REGULAR, fig, images, background=255)
+    canvas.draw()
+    rendered = np.asarray(canvas.buffer_rgba())[..., :3]
+    expected = image_mosaic(REGULAR, images, DPI, background=255)
+    assert (rendered == expected).all()
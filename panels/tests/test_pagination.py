@@ -0,0 +1,98 @@
+"""Tests for splitting panels across pages."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import types
+
+from hypothesis import given
+from hypothesis.strategies import integers
+import pytest
+
+from panels import (FigureSizeLocator, FrozenPanelSizeLocator,
+                    PanelSizeLocator, page_count, paginate)
+from panels.tests import gridsize_st
+
+
+@pytest.mark.parametrize('order', ['row', 'column'])
+@pytest.mark.parametrize('shrink_last', [False, True])
+@given(rows=integers(1, 10), columns=integers(1, 10), count=integers(0, 500))
+def test_every_panel_placed_once(order, shrink_last, rows, columns, count):
+    l = PanelSizeLocator(rows, columns, 10, 8, hsep=1, vsep=2)
+    pages = list(paginate(l, count, order=order, shrink_last=shrink_last))
+    assert len(pages) == page_count(l, count)
+    assert [page.number for page in pages] == list(range(len(pages)))
+    assert [i for page in pages for i in page.indices] == list(range(count))
+    for page in pages:
+        assert len(page.cells) == len(page.indices)
+        assert len(set(page.cells)) == len(page.cells)
+        for row, column in page.cells:
+            assert 0 <= row < page.locator.rows
+            assert 0 <= column < page.locator.columns
+        assert page.locator.panelwidth_fig * page.locator.figwidth == \
+            pytest.approx(10)
+        assert page.locator.panelheight_fig * page.locator.figheight == \
+            pytest.approx(8)
+
+
+def test_lazy():
+    l = PanelSizeLocator(10, 10, 10, 10)
+    pages = paginate(l, 10 ** 9)
+    assert isinstance(pages, types.GeneratorType)
+    assert next(pages).indices == range(0, 100)
+    assert next(pages).indices == range(100, 200)
+
+
+def test_full_pages_share_locator():
+    l = FigureSizeLocator(4, 3, figwidth=210, figheight=297, hsep=5, vsep=5)
+    pages = list(paginate(l, 50))
+    assert len(pages) == 5
+    assert all(page.locator is pages[0].locator for page in pages)
+    assert pages[0].locator == l.frozen()
+    assert pages[-1].indices == range(48, 50)
+    assert pages[-1].cells == [(0, 0), (0, 1)]
+
+
+@pytest.mark.parametrize('order, rows, columns', [('row', 2, 3),
+                                                  ('column', 4, 2)])
+def test_shrink_last(order, rows, columns):
+    l = FigureSizeLocator(4, 3, figwidth=210, figheight=297, hsep=5, vsep=5,
+                          padtop=10)
+    last = list(paginate(l, 17, order=order, shrink_last=True))[-1]
+    assert isinstance(last.locator, FrozenPanelSizeLocator)
+    assert (last.locator.rows, last.locator.columns) == (rows, columns)
+    assert last.locator.panel_position(0, 0)[2:] != l.panel_position(0, 0)[2:]
+    assert last.locator.panelwidth == l.panelwidth
+    assert last.locator.panelheight == l.panelheight
+    assert last.locator.padtop == l.padtop
+
+
+@given(rows=gridsize_st, columns=gridsize_st)
+def test_column_order_cells(rows, columns):
+    l = PanelSizeLocator(rows, columns, 1, 1)
+    page, = paginate(l, rows * columns, order='column')
+    assert page.cells == [(r, c) for c in range(columns)
+                          for r in range(rows)]
+
+
+def test_invalid():
+    l = PanelSizeLocator(2, 2, 10, 10)
+    with pytest.raises(ValueError):
+        paginate(l, 10, order='diagonal')
+    with pytest.raises(ValueError):
+        paginate(l, -1)
@@ -0,0 +1,123 @@
+"""Tests for rendering panels separately and compositing them."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+import matplotlib.image
+from matplotlib.patches import Rectangle
+import numpy as np
+import pytest
+
+import panels._raster
+from panels import (PanelSizeLocator, render_panels, render_panels_png,
+                    write_png)
+
+
+#: The resolution panels are rendered at.
+DPI = 64
+
+#: A locator whose panels fall exactly on pixels at the test resolution.
+REGULAR = PanelSizeLocator(2, 3, 1.5, 0.75, hsep=0.125, vsep=0.25,
+                           padleft=0.25, padtop=0.125, units='inches')
+
+#: A locator whose panels do not fall on pixels at the test resolution.
+IRREGULAR = PanelSizeLocator(3, 2, 11.3, 7.7, hsep=1.1, vsep=0.9,
+                             padright=3.3)
+
+
+def fill(ax, row, column):
+    """Fill a panel with a grey level identifying it."""
+    ax.set_axis_off()
+    ax.add_patch(Rectangle((0, 0), 1, 1, transform=ax.transAxes,
+                           color=str((10 * row + column) / 100),
+                           linewidth=0))
+
+
+def check_panels(image, locator):
+    boxes = locator.panel_pixel_boxes(DPI)
+    covered = np.zeros(image.shape[:2], dtype=bool)
+    for row in range(locator.rows):
+        for column in range(locator.columns):
+            left, top, right, bottom = boxes[row, column]
+            level = np.uint8(round(255 * (10 * row + column) / 100))
+            panel = image[top:bottom, left:right]
+            assert (panel[..., :3] == level).all()
+            assert (panel[..., 3] == 255).all()
+            covered[top:bottom, left:right] = True
+    assert (image[~covered] == 255).all()
+
+
+@pytest.mark.parametrize('locator', [REGULAR, IRREGULAR])
+@pytest.mark.parametrize('block', [(1, 1), (2, 2)])
+def test_render_panels(locator, block):
+    image = render_panels(locator, fill, DPI, block=block, max_workers=1)
+    width, height = locator.figsize_px(DPI)
+    assert image.shape == (height, width, 4)
+    assert image.dtype == np.uint8
+    check_panels(image, locator)
+
+
+def test_render_panels_workers():
+    image = render_panels(IRREGULAR, fill, DPI, max_workers=2)
+    check_panels(image, IRREGULAR)
+
+
+def test_render_panels_out():
+    width, height = REGULAR.figsize_px(DPI)
+    out = np.full((height, width, 4), 255, dtype=np.uint8)
+    assert render_panels(REGULAR, fill, DPI, max_workers=1, out=out) is out
+    check_panels(out, REGULAR)
+    with pytest.raises(ValueError):
+        render_panels(REGULAR, fill, DPI, max_workers=1, out=out[1:])
+
+
+def test_render_panels_empty_block():
+    with pytest.raises(ValueError):
+        render_panels(REGULAR, fill, DPI, block=(0, 1), max_workers=1)
+
+
+@pytest.mark.parametrize('channels', [3, 4])
+def test_write_png(tmp_path, channels, monkeypatch):
+    # Use small bands so the image is written in several of them:
+    monkeypatch.setattr(panels._raster, '_BAND_BYTES', 1000)
+    image = np.random.RandomState(0).randint(
+        0, 256, size=(97, 61, channels)).astype(np.uint8)
+    path = str(tmp_path / 'image.png')
+    write_png(path, image)
+    read = matplotlib.image.imread(path)
+    assert read.shape == image.shape
+    assert (np.rint(read * 255).astype(np.uint8) == image).all()
+
+
+def test_write_png_invalid(tmp_path):
+    with pytest.raises(ValueError):
+        write_png(str(tmp_path / 'image.png'), np.zeros((4, 4, 2), np.uint8))
+    with pytest.raises(ValueError):
+        write_png(str(tmp_path / 'image.png'), np.zeros((4, 4, 4)))
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_render_panels_png(tmp_path, max_workers):
+    path = str(tmp_path / 'panels.png')
+    render_panels_png(IRREGULAR, fill, DPI, path, block=(2, 1),
+                      max_workers=max_workers, tempdir=str(tmp_path))
+    image = np.rint(matplotlib.image.imread(path) * 255).astype(np.uint8)
+    check_panels(image, IRREGULAR)
+    assert (image == render_panels(IRREGULAR, fill, DPI, block=(2, 1),
+                                   max_workers=1)).all()
+    assert [p.name for p in tmp_path.iterdir()] == ['panels.png']
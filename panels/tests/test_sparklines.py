@@ -0,0 +1,136 @@
+"""Tests for lightweight panels drawn in a single axes."""
+# Copyright 2017 Andrew Dawson
+#
+# This file is part of panel-plots.
+#
+# panel-plots is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# panel-plots is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with panel-plots.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.figure import Figure
+import numpy as np
+import pytest
+
+from panels import PanelSizeLocator, sparklines
+
+
+@pytest.fixture
+def locator():
+    return PanelSizeLocator(3, 4, 30, 20, hsep=5, vsep=5, padleft=10,
+                            padbottom=10)
+
+
+def random_data(n, size=50, seed=0):
+    rng = np.random.RandomState(seed)
+    return [(np.arange(size) * (i + 1), rng.normal(size=size) * (i + 1))
+            for i in range(n)]
+
+
+def figure_coordinates(ax, x, y):
+    """The figure coordinates of data plotted in an axes."""
+    # Accessing the limits applies any pending autoscaling:
+    ax.get_xlim()
+    ax.get_ylim()
+    display = ax.transData.transform(np.column_stack([x, y]))
+    return ax.figure.transFigure.inverted().transform(display)
+
+
+@pytest.mark.parametrize('order', ['row', 'column'])
+def test_matches_per_axes(locator, order):
+    """Lines are placed where per-panel axes would place them."""
+    data = random_data(10)
+    fig = Figure(figsize=locator.figsize)
+    lines = sparklines(locator, fig, data, order=order)
+    assert len(fig.axes) == 1
+    assert isinstance(lines.collection, LineCollection)
+    segments = lines.collection.get_segments()
+    assert len(segments) == len(data)
+    reference = Figure(figsize=locator.figsize)
+    positions = locator.panel_positions(order=order, flatten=True)
+    for (x, y), segment, position in zip(data, segments, positions):
+        ax = reference.add_axes(position)
+        ax.plot(x, y)
+        expected = figure_coordinates(ax, x, y)
+        assert np.allclose(segment, expected)
+
+
+def test_fixed_limits(locator):
+    data = [([0, 1, 2], [0, 5, 10])]
+    fig = Figure(figsize=locator.figsize)
+    lines = sparklines(locator, fig, data, xlim=(0, 2), ylim=(0, 5))
+    x, y, w, h = locator.panel_position(0, 0)
+    segment = lines.collection.get_segments()[0]
+    assert np.allclose(segment, [[x, y], [x + w / 2, y + h], [x + w, y + h]])
+
+
+def test_constant_data(locator):
+    fig = Figure(figsize=locator.figsize)
+    lines = sparklines(locator, fig, [([1, 1], [2, 2])])
+    x, y, w, h = locator.panel_position(0, 0)
+    assert np.allclose(lines.collection.get_segments()[0],
+                       [[x + w / 2, y + h / 2]] * 2)
+
+
+def test_missing_data(locator):
+    """Missing values leave a gap, as they do in per-panel axes."""
+    data = [([0, 1, 2, 3], [1, np.nan, 2, 3]), ([0, 1], [np.nan, np.nan])]
+    fig = Figure(figsize=locator.figsize)
+    lines = sparklines(locator, fig, data)
+    # The segments of a collection skip missing values, its paths keep
+    # them so the line is broken where they are:
+    segments = [path.vertices for path in lines.collection.get_paths()]
+    assert np.isnan(segments[0][1, 1])
+    reference = Figure(figsize=locator.figsize)
+    ax = reference.add_axes(locator.panel_position(0, 0))
+    ax.plot(*data[0])
+    expected = figure_coordinates(ax, *data[0])
+    assert np.allclose(segments[0][[0, 2, 3]], expected[[0, 2, 3]])
+    assert np.isnan(segments[1][:, 1]).all()
+    x, y, w, h = locator.panel_position(0, 1)
+    assert np.allclose(segments[1][:, 0], [x + w * 0.05 / 1.1,
+                                           x + w * 1.05 / 1.1])
+
+
+def test_scatter_and_frames(locator):
+    data = random_data(12, size=5)
+    fig = Figure(figsize=locator.figsize)
+    points = sparklines(locator, fig, data, kind='scatter', frames=True,
+                        frame_kw={'linewidths': 0.5})
+    assert isinstance(points.collection, PathCollection)
+    assert points.collection.get_offsets().shape == (60, 2)
+    frames = points.frames.get_segments()
+    assert len(frames) == 12
+    x, y, w, h = locator.panel_position(2, 3)
+    assert np.allclose(frames[-1][[0, 2]], [[x, y], [x + w, y + h]])
+    assert points.axes.get_xlim() == (0, 1)
+
+
+def test_empty_panels(locator):
+    data = [([], []), ([0, 1], [0, 1])]
+    fig = Figure(figsize=locator.figsize)
+    lines = sparklines(locator, fig, data)
+    segments = lines.collection.get_segments()
+    assert len(segments[0]) == 0
+    assert len(segments[1]) == 2
+
+
+def test_errors(locator):
+    fig = Figure(figsize=locator.figsize)
+    with pytest.raises(ValueError):
+        sparklines(locator, fig, random_data(13))
+    with pytest.raises(ValueError):
+        sparklines(locator, fig, [([0, 1], [0])])
+    with pytest.raises(ValueError):
+        sparklines(locator, fig, random_data(1), kind='bar')
@@ -27,6 +27,8 @@ except ImportError:
 
 # Define the required dependencies:
 install_requires = [
+    'matplotlib',
+    'numpy',
     'versioneer',
     'setuptools>=0.7.2'
 ]
@@ -45,6 +47,7 @@ setup(
     description='Organize matplotlib plots in panels',
     license='GPL3',
     install_requires=install_requires,
+    python_requires='>=3.7',
     packages=packages,
     cmdclass=versioneer.get_cmdclass(),
 )